@@ -0,0 +1,132 @@
+"""
+EPOCH 2026 - Admission control
+A bounded number of in-flight slots with a first-come-first-served waiting line.
+Nothing blocks: a request that cannot run yet is answered at once with a ticket
+holding its place in line, and the client comes back with it after Retry-After.
+"""
+
+import collections
+import math
+import secrets
+import threading
+import time
+
+# Request header a client resends its ticket in
+TICKET_HEADER = 'X-Queue-Ticket'
+
+
+class AdmissionRejected(Exception):
+    """
+    No slot for this request yet
+
+    `ticket` holds the request's place in line; it is None when the line was
+    full and the client has to start over.
+    """
+
+    def __init__(self, position, estimated_wait, retry_after, ticket=None):
+        super().__init__(f'No free slot (position {position}, about {estimated_wait:.0f}s)')
+        self.position = position
+        self.estimated_wait = estimated_wait
+        self.retry_after = retry_after
+        self.ticket = ticket
+
+
+class AdmissionController:
+    """
+    Limit how many requests run a handler at once
+
+    Requests beyond max_in_flight get a ticket and a place in a FIFO line instead
+    of a thread parked on a lock. Free slots go to the front of the line: a ticket
+    is admitted once it is within the first (free slots) places, and a newcomer only
+    when there are more free slots than tickets. Tickets not presented again within
+    ticket_ttl seconds drop out, so clients that gave up do not hold the line.
+    Requests that would make the line longer than max_queue get no ticket.
+
+    The lock is only held for bookkeeping, never across I/O, so the async routes
+    can call try_acquire()/release() straight from the event loop.
+
+    Args:
+        max_in_flight: Requests allowed to run the handler concurrently
+        max_queue: Tickets allowed in line
+        ticket_ttl: Seconds a ticket stays valid after it was last presented
+    """
+
+    # Weight of the latest service time in the moving average
+    SMOOTHING = 0.2
+
+    def __init__(self, max_in_flight, max_queue, ticket_ttl):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.ticket_ttl = ticket_ttl
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # ticket -> time it was last presented, oldest ticket first
+        self._line = collections.OrderedDict()
+        self._service_seconds = None
+
+    def estimated_wait(self, position):
+        """Seconds until the request at `position` in line should get a slot"""
+        service_seconds = self._service_seconds if self._service_seconds is not None else 1.0
+        return position * service_seconds / self.max_in_flight
+
+    def retry_after(self, position):
+        """Whole seconds to wait before trying again, soon enough to keep the ticket"""
+        return max(1, min(math.ceil(self.estimated_wait(position)), math.floor(self.ticket_ttl / 2)))
+
+    def _expire(self, now):
+        for ticket, seen in list(self._line.items()):
+            if now - seen > self.ticket_ttl:
+                del self._line[ticket]
+
+    def try_acquire(self, ticket=None):
+        """
+        Take a slot if this request's turn has come
+
+        Args:
+            ticket: Ticket from an earlier AdmissionRejected, if the client has one
+
+        Raises:
+            AdmissionRejected with the (new or same) ticket while the request has
+            to wait, or without one if the line is full
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            free = self.max_in_flight - self._in_flight
+            if ticket in self._line:
+                position = list(self._line).index(ticket) + 1
+                if position <= free:
+                    del self._line[ticket]
+                    self._in_flight += 1
+                    return
+                self._line[ticket] = now
+            else:
+                position = len(self._line) + 1
+                if position <= free:
+                    self._in_flight += 1
+                    return
+                if position > self.max_queue:
+                    raise AdmissionRejected(position, self.estimated_wait(position), self.retry_after(position))
+                ticket = secrets.token_urlsafe(16)
+                self._line[ticket] = now
+            raise AdmissionRejected(position, self.estimated_wait(position), self.retry_after(position), ticket)
+
+    def release(self, service_seconds=None):
+        """Give a slot back"""
+        with self._lock:
+            if service_seconds is not None:
+                if self._service_seconds is None:
+                    self._service_seconds = service_seconds
+                else:
+                    self._service_seconds += self.SMOOTHING * (service_seconds - self._service_seconds)
+            self._in_flight -= 1
+
+    def snapshot(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'inFlight': self._in_flight,
+                'queued': len(self._line),
+                'averageServiceSeconds': self._service_seconds
+            }
@@ -0,0 +1,526 @@
+"""
+EPOCH 2026 - ASGI entry point
+The signup path (register, login, check-email, registration-status) runs natively
+async on Motor and httpx, so one worker overlaps many MongoDB and reCAPTCHA waits.
+Every other route is handed to the Flask app through a WSGI adapter.
+
+Run:
+    pip install -r requirements-async.txt
+    uvicorn api.asgi:app --workers 2
+
+Behind a reverse proxy, set TRUSTED_PROXY_HOPS and pass --no-proxy-headers to
+uvicorn, so X-Forwarded-For is read once, by the rate limiter.
+"""
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_etags, quote_etag
+
+# Add parent directory to path to import app
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import app as epoch
+import idempotency
+import payments
+import responses
+import storage
+from fingerprint import normalise_transaction_id, screenshot_fingerprint
+from stats import stats_update, user_stats_increments
+from ratelimit import client_address
+from admission import TICKET_HEADER, AdmissionRejected
+from validation import validate_registration
+
+mongo_client = None
+users_collection = None
+counters_collection = None
+idempotency_collection = None
+stats_collection = None
+screenshots_bucket = None
+http_client = None
+
+_db_initialized = False
+
+
+def init_async_db(client=None):
+    """
+    Create the Motor collections the async routes use (once per process)
+
+    Args:
+        client: Use this AsyncIOMotorClient instead of building one from MONGODB_URI
+    """
+    global mongo_client, users_collection, counters_collection, idempotency_collection
+    global stats_collection, screenshots_bucket, _db_initialized
+
+    if _db_initialized:
+        return
+    _db_initialized = True
+
+    if client is None and not epoch.MONGODB_URI:
+        return
+    mongo_client = client or AsyncIOMotorClient(epoch.normalize_mongodb_uri(epoch.MONGODB_URI))
+    db = mongo_client[epoch.MONGODB_DATABASE]
+    users_collection = db['users']
+    counters_collection = db['counters']
+    idempotency_collection = db['idempotency_keys']
+    stats_collection = db['stats']
+    screenshots_bucket = AsyncIOMotorGridFSBucket(db, bucket_name='payment_screenshots')
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_):
+    global http_client
+
+    init_async_db()
+    # The Flask routes and the shared capacity/email caches use the synchronous driver.
+    # Those caches guard their state with threading.Locks, so every call into them
+    # from a coroutine goes through asyncio.to_thread rather than blocking the loop.
+    await asyncio.to_thread(epoch.init_db)
+    http_client = httpx.AsyncClient(timeout=httpx.Timeout(
+        epoch.RECAPTCHA_READ_TIMEOUT, connect=epoch.RECAPTCHA_CONNECT_TIMEOUT
+    ))
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
+
+def db_unavailable():
+    return JSONResponse(responses.DATABASE_UNAVAILABLE, 500)
+
+
+# ========== REQUEST METRICS ==========
+# The async routes report to the same /api/metrics histograms as the Flask
+# routes, under the same route labels.
+
+def measured(route):
+    """Record handler time, status and the stages noted in request.state.stages"""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request):
+            request.state.stages = {}
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = await view(request)
+                status = response.status_code
+                return response
+            finally:
+                epoch.request_metrics.observe_request(
+                    route, request.method, status, time.perf_counter() - started, request.state.stages
+                )
+        return wrapper
+    return decorator
+
+
+@contextlib.asynccontextmanager
+async def stage(request, name):
+    """Time the enclosed block as a stage of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = request.state.stages
+        stages[name] = stages.get(name, 0.0) + time.perf_counter() - started
+
+
+# ========== SIGNUP ADMISSION ==========
+# The same per-process controller as app.admission_controlled (see app.py for
+# what queued clients see). try_acquire() never waits, so it runs on the loop.
+
+def admission_controlled(view):
+    """Reject signups once full, and queue them behind a bounded number of slots"""
+    @functools.wraps(view)
+    async def wrapper(request):
+        if users_collection is None:
+            return await view(request)
+        try:
+            if await asyncio.to_thread(epoch.capacity.count) >= epoch.MAX_REGISTRATIONS:
+                return JSONResponse(responses.REGISTRATION_CLOSED, 403)
+        except Exception as e:
+            # The handler reports the database problem
+            print(f"Admission capacity check error: {e}")
+
+        try:
+            epoch.signup_admission.try_acquire(request.headers.get(TICKET_HEADER))
+        except AdmissionRejected as e:
+            return JSONResponse(responses.signup_queued(e), 503, headers={'Retry-After': str(e.retry_after)})
+
+        started = time.monotonic()
+        try:
+            return await view(request)
+        finally:
+            epoch.signup_admission.release(time.monotonic() - started)
+    return wrapper
+
+
+# ========== IDEMPOTENCY KEYS ==========
+# Same protocol and records as app.idempotent (see idempotency.py), so a key
+# claimed by either entry point is honoured by the other.
+
+def idempotent(view):
+    """Replay the stored response for a repeated Idempotency-Key"""
+    @functools.wraps(view)
+    async def wrapper(request):
+        key = idempotency.request_key(request.headers)
+        if not key or idempotency_collection is None:
+            return await view(request)
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            return JSONResponse(idempotency.INVALID_KEY, 400)
+
+        record_id = idempotency.record_id(request.url.path, key)
+        try:
+            await idempotency_collection.insert_one(idempotency.pending_record(record_id))
+        except DuplicateKeyError:
+            stored = idempotency.stored_response(await idempotency_collection.find_one({'_id': record_id}))
+            if stored:
+                body, status_code = stored
+                return JSONResponse(body, status_code, headers=idempotency.REPLAYED_HEADERS)
+            if not await idempotency_collection.find_one_and_update(*idempotency.stale_claim_takeover(record_id)):
+                return JSONResponse(idempotency.IN_PROGRESS, 409)
+
+        response = await view(request)
+        try:
+            if idempotency.should_store(response.status_code):
+                await idempotency_collection.update_one(
+                    {'_id': record_id},
+                    idempotency.completed_update(response.status_code, json.loads(response.body))
+                )
+            else:
+                await idempotency_collection.delete_one({'_id': record_id})
+        except Exception as e:
+            print(f"Idempotency record error: {e}")
+        return response
+    return wrapper
+
+
+# ========== ASYNC HELPERS ==========
+
+async def verify_recaptcha(response_token):
+    """Ask siteverify about a token (raises httpx.HTTPError on network failures)"""
+    reply = await http_client.post(epoch.RECAPTCHA_VERIFY_URL, data={
+        'secret': epoch.RECAPTCHA_SECRET_KEY,
+        'response': response_token
+    })
+    return reply.json()
+
+
+async def email_exists(email):
+    if not await asyncio.to_thread(epoch.email_filter.might_contain, email):
+        return False
+    return await users_collection.find_one({'email': email}, {'_id': 1}) is not None
+
+
+async def allocate_epoch_number():
+    """Async twin of storage.allocate_epoch_number() for a single number"""
+    while True:
+        counter = await counters_collection.find_one_and_update(
+            *storage.free_list_pop(),
+            return_document=ReturnDocument.BEFORE
+        )
+        if not counter:
+            break
+        number = counter['free'][0]
+        if not await users_collection.count_documents(storage.epoch_number_query(number), limit=1):
+            return number
+
+    for _ in range(2):
+        counter = await counters_collection.find_one_and_update(
+            *storage.allocation_query(epoch.MAX_REGISTRATIONS),
+            return_document=ReturnDocument.AFTER
+        )
+        if counter:
+            return counter['seq']
+        if await counters_collection.count_documents({'_id': storage.EPOCH_ID_COUNTER}, limit=1):
+            return None
+        # Seeding scans users once per database; reuse the synchronous version
+        await asyncio.to_thread(storage.seed_epoch_counter)
+    return None
+
+
+async def release_epoch_number(number):
+    try:
+        result = await counters_collection.update_one(*storage.release_query(number))
+        if not result.modified_count:
+            await counters_collection.update_one(*storage.free_list_push(number))
+    except Exception as e:
+        print(f"EPOCH number release error: {e}")
+
+
+async def delete_payment_screenshot(screenshot_id):
+    try:
+        await screenshots_bucket.delete(screenshot_id)
+    except Exception as e:
+        print(f"Payment screenshot delete error: {e}")
+
+
+async def find_payment_matches(transaction_key, screenshot_hash=None):
+    candidates = []
+    for query in payments.payment_match_queries(transaction_key, screenshot_hash):
+        candidates.extend(await users_collection.find(query, payments.PAYMENT_MATCH_PROJECTION).to_list(payments.PAYMENT_MATCH_LIMIT))
+    return payments.classify_payment_matches(candidates, transaction_key, screenshot_hash)
+
+
+async def update_stats(increments):
+    try:
+        await stats_collection.update_one(*stats_update(increments), upsert=True)
+    except Exception as e:
+        print(f"Stats update error (run 'flask rebuild-stats' to reconcile): {e}")
+
+
+async def bump_data_version():
+    try:
+        await counters_collection.update_one(*storage.DATA_VERSION_BUMP, upsert=True)
+    except Exception as e:
+        print(f"Data version bump error: {e}")
+
+
+def cached_json(request, etag, build, cache_control):
+    """Async-side twin of app.cached_json(): 304 when If-None-Match already holds the (weak) ETag"""
+    headers = {'ETag': quote_etag(etag, weak=True), 'Cache-Control': cache_control}
+    if parse_etags(request.headers.get('if-none-match')).contains_weak(etag):
+        return Response(status_code=304, headers=headers)
+    response = build()
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+
+def client_ip(request):
+    return client_address(
+        request.headers.get('x-forwarded-for'),
+        request.client.host if request.client else None,
+        epoch.TRUSTED_PROXY_HOPS
+    )
+
+
+async def rate_limit_response(checks, record=True):
+    """A 429 response if any (limiter, key) pair is over its limit, else None"""
+    retry_after = await asyncio.to_thread(epoch.check_rate_limits, checks, record)
+    if not retry_after:
+        return None
+    return JSONResponse(responses.too_many_attempts(retry_after), 429, headers={'Retry-After': str(retry_after)})
+
+
+# ========== ROUTES ==========
+
+@measured('/api/register')
+@admission_controlled
+@idempotent
+async def register(request):
+    """Register a new user"""
+    if users_collection is None:
+        return db_unavailable()
+
+    try:
+        form = await request.form()
+        data = {key: value for key, value in form.items() if isinstance(value, str)}
+
+        recaptcha_response = data.get('g-recaptcha-response')
+        if not recaptcha_response:
+            return JSONResponse(responses.RECAPTCHA_MISSING, 400)
+
+        try:
+            async with stage(request, 'recaptcha'):
+                recaptcha_result = await verify_recaptcha(recaptcha_response)
+            if not recaptcha_result.get('success'):
+                print(f"reCAPTCHA verification failed: {recaptcha_result.get('error-codes', [])}")
+                return JSONResponse(responses.RECAPTCHA_FAILED, 400)
+        except httpx.HTTPError as e:
+            print(f"reCAPTCHA API error: {e}")
+            return JSONResponse(responses.RECAPTCHA_UNAVAILABLE, 500)
+
+        errors = validate_registration(data)
+        if errors:
+            return JSONResponse(responses.validation_failed(errors), 400)
+
+        email = data['email'].lower().strip()
+
+        screenshot = form.get('paymentScreenshot')
+        screenshot_bytes = None
+        if screenshot is not None and not isinstance(screenshot, str) and screenshot.filename:
+            screenshot_bytes = await screenshot.read(responses.MAX_SCREENSHOT_BYTES + 1)
+            if len(screenshot_bytes) > responses.MAX_SCREENSHOT_BYTES:
+                return JSONResponse(responses.SCREENSHOT_TOO_LARGE, 400)
+
+        if await email_exists(email):
+            return JSONResponse(responses.EMAIL_REGISTERED, 409)
+
+        async with stage(request, 'payment_check'):
+            screenshot_hash = None
+            if screenshot_bytes is not None:
+                screenshot_hash = await asyncio.to_thread(screenshot_fingerprint, screenshot_bytes)
+            payment_matches = await find_payment_matches(normalise_transaction_id(data['transactionId']), screenshot_hash)
+        if payments.payment_rejected(payment_matches):
+            return JSONResponse(responses.DUPLICATE_PAYMENT, 409)
+
+        async with stage(request, 'password_hash'):
+            password_hash = await asyncio.to_thread(epoch.password_hasher.hash, data['password'])
+
+        async with stage(request, 'epoch_allocation'):
+            next_number = await allocate_epoch_number()
+        if next_number is None:
+            await asyncio.to_thread(epoch.capacity.invalidate)
+            return JSONResponse(responses.REGISTRATION_CLOSED, 403)
+        epoch_id = f"EPOCH{next_number:03d}"
+
+        screenshot_id = None
+        if screenshot_bytes is not None:
+            try:
+                screenshot_id = await screenshots_bucket.upload_from_stream(
+                    epoch_id,
+                    screenshot_bytes,
+                    metadata={
+                        'epochId': epoch_id,
+                        'contentType': screenshot.content_type,
+                        'originalName': screenshot.filename
+                    }
+                )
+            except Exception:
+                await release_epoch_number(next_number)
+                raise
+
+        user_doc = storage.build_user_doc(data, password_hash, next_number, screenshot_id, screenshot_hash)
+        if payment_matches:
+            user_doc['paymentReview'] = payments.payment_review(payment_matches)
+        try:
+            await users_collection.insert_one(user_doc)
+        except Exception:
+            if screenshot_id is not None:
+                await delete_payment_screenshot(screenshot_id)
+            await release_epoch_number(next_number)
+            raise
+
+        await asyncio.to_thread(epoch.capacity.record_registration)
+        await asyncio.to_thread(epoch.email_filter.add, email)
+        await update_stats(user_stats_increments(user_doc))
+        await bump_data_version()
+        return JSONResponse(responses.registration_succeeded(next_number, epoch.MAX_REGISTRATIONS), 201)
+
+    except DuplicateKeyError:
+        return JSONResponse(responses.EMAIL_REGISTERED, 409)
+    except Exception as e:
+        print(f"Registration error: {e}")
+        return JSONResponse(responses.REGISTRATION_ERROR, 500)
+
+
+@measured('/api/login')
+async def login(request):
+    """Authenticate user login"""
+    if users_collection is None:
+        return db_unavailable()
+
+    try:
+        data = await request.json()
+        email = data.get('email') if isinstance(data, dict) else None
+        account = email.lower().strip() if isinstance(email, str) and email.strip() else None
+        limited = await rate_limit_response([(epoch.login_ip_limiter, client_ip(request))])
+        if limited:
+            return limited
+        # Only failed logins count against the account (see app.failures_limited)
+        account_limit = [(epoch.login_account_limiter, account)]
+        limited = await rate_limit_response(account_limit, record=False)
+        if limited:
+            return limited
+
+        if not data or 'email' not in data or 'password' not in data:
+            return JSONResponse(responses.LOGIN_FIELDS_REQUIRED, 400)
+
+        email = data['email'].lower().strip()
+        password = data['password']
+
+        user = await users_collection.find_one({'email': email}, epoch.USER_AUTH_PROJECTION)
+        if user:
+            async with stage(request, 'password_check'):
+                password_ok = await asyncio.to_thread(epoch.password_hasher.verify, user['password'], password)
+        if not user or not password_ok:
+            await asyncio.to_thread(epoch.check_rate_limits, account_limit)
+            return JSONResponse(responses.INVALID_LOGIN, 401)
+
+        if epoch.password_hasher.needs_rehash(user['password']):
+            try:
+                async with stage(request, 'password_rehash'):
+                    new_hash = await asyncio.to_thread(epoch.password_hasher.hash, password)
+                await users_collection.update_one(
+                    {'email': email, 'password': user['password']},
+                    {'$set': {'password': new_hash}}
+                )
+            except Exception as e:
+                print(f"Password rehash error: {e}")
+
+        return JSONResponse(responses.login_succeeded(user), 200)
+
+    except Exception as e:
+        print(f"Login error: {e}")
+        return JSONResponse(responses.LOGIN_ERROR, 500)
+
+
+@measured('/api/check-email')
+async def check_email(request):
+    """Check if email is already registered"""
+    if users_collection is None:
+        return JSONResponse({'exists': False}, 200)
+
+    limited = await rate_limit_response([(epoch.check_email_limiter, client_ip(request))])
+    if limited:
+        return limited
+
+    try:
+        data = await request.json()
+        email = data.get('email', '').lower().strip()
+        if not email:
+            return JSONResponse({'exists': False}, 200)
+        return JSONResponse({'exists': await email_exists(email)}, 200)
+    except Exception as e:
+        print(f"Check email error: {e}")
+        return JSONResponse({'exists': False}, 200)
+
+
+@measured('/api/registration-status')
+async def registration_status(request):
+    """Get current registration status and remaining slots"""
+    if users_collection is None:
+        return JSONResponse({
+            'isOpen': False,
+            'message': 'Database connection not available'
+        }, 200)
+
+    try:
+        current_count = await asyncio.to_thread(epoch.capacity.count)
+        return cached_json(request, responses.status_etag(current_count, epoch.MAX_REGISTRATIONS), lambda: JSONResponse(
+            responses.registration_status(current_count, epoch.MAX_REGISTRATIONS), 200
+        ), epoch.public_cache_control())
+    except Exception as e:
+        print(f"Registration status error: {e}")
+        return JSONResponse(responses.registration_status_unknown(epoch.MAX_REGISTRATIONS), 200)
+
+
+# Same open policy as CORS(app); preflight OPTIONS requests fall through to Flask-CORS
+cors = [Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+
+app = Starlette(
+    routes=[
+        Route('/api/register', register, methods=['POST'], middleware=cors),
+        Route('/api/login', login, methods=['POST'], middleware=cors),
+        Route('/api/check-email', check_email, methods=['POST'], middleware=cors),
+        Route('/api/registration-status', registration_status, methods=['GET'], middleware=cors),
+        # Everything else (event registration, exports, health, metrics, ...) is the Flask app
+        Mount('/', WSGIMiddleware(epoch.app)),
+    ],
+    lifespan=lifespan
+)
@@ -0,0 +1,555 @@
+"""
+EPOCH 2026 - Benchmark harness
+Drives the Flask API under a real WSGI server against a local MongoDB stand-in
+
+Usage:
+    python benchmark.py load --backend mongod --mongo-uri mongodb://localhost:27017
+    python benchmark.py load --backend mongomock --concurrency 32 --requests 500
+    python benchmark.py load --output run.json --compare baseline.json
+    python benchmark.py hashing --methods scrypt:16384:8:1 pbkdf2:sha256:600000 --workers 0 4
+    python benchmark.py async --concurrency 128 --requests 400 --recaptcha-delay 0.3
+    python benchmark.py ratelimit --threads 1 8 --redis-url redis://localhost:6379/15
+
+The mongomock backend needs 'pip install mongomock'. It cannot report MongoDB
+operation counts. reCAPTCHA is always answered by recaptcha.py's local stub.
+The async comparison needs a real mongod and 'pip install -r requirements-async.txt'.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from pymongo import MongoClient, monitoring
+
+from events import NONTECH_EVENTS, TECH_EVENTS
+from passwords import PasswordHasher
+from ratelimit import MemoryBackend, RedisBackend, benchmark_limiter
+from recaptcha import StubSiteverifyServer
+
+try:
+    import mongomock
+    import mongomock.gridfs
+except ImportError:
+    mongomock = None
+
+# Scratch database - dropped before and after every run
+BENCHMARK_DATABASE = 'epoch_2026_benchmark'
+BENCHMARK_PASSWORD = 'Benchmark#2026'
+
+ROUTES = [
+    'register',
+    'login',
+    'check-email',
+    'validate-epoch-id',
+    'register-event',
+    'registration-status',
+    'health',
+]
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts every command pymongo sends"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def started(self, event):
+        with self._lock:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# ========== HELPERS ==========
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarise(latencies, statuses, elapsed, mongo_ops):
+    """
+    Latency percentiles (ms), throughput and status breakdown for one route
+
+    Quick 4xx/5xx answers pull the overall percentiles down, so successes and
+    errors also get their own p50/p95.
+    """
+    ordered = sorted(latencies)
+    ok = sorted(latency for latency, status in zip(latencies, statuses) if status < 400)
+    errors = sorted(latency for latency, status in zip(latencies, statuses) if status >= 400)
+    status_counts = {}
+    for status in statuses:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    return {
+        'requests': len(ordered),
+        'statusCounts': status_counts,
+        'clientErrors': sum(1 for status in statuses if 400 <= status < 500),
+        'rejected': sum(1 for status in statuses if status == 503),
+        'serverErrors': sum(1 for status in statuses if status >= 500 and status != 503),
+        'p50Ms': percentile(ordered, 50),
+        'p95Ms': percentile(ordered, 95),
+        'p99Ms': percentile(ordered, 99),
+        'maxMs': ordered[-1] if ordered else None,
+        'okP50Ms': percentile(ok, 50),
+        'okP95Ms': percentile(ok, 95),
+        'errorP50Ms': percentile(errors, 50),
+        'errorP95Ms': percentile(errors, 95),
+        'throughputRps': len(ordered) / elapsed if elapsed else None,
+        'mongoOpsPerRequest': mongo_ops / len(ordered) if mongo_ops is not None and ordered else None,
+    }
+
+
+def format_ms(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def load_app(mongo_client, stub_url, max_registrations, concurrency):
+    """Import app.py wired to the benchmark database and the reCAPTCHA stub"""
+    os.environ['MONGODB_DATABASE'] = BENCHMARK_DATABASE
+    os.environ['RECAPTCHA_VERIFY_URL'] = stub_url
+    os.environ.setdefault('RECAPTCHA_SECRET_KEY', 'benchmark')
+    # Every request comes from 127.0.0.1 and reuses a few accounts; with the
+    # limits on, most of the timings would be of 429 responses
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    # One signup slot per client thread, so admission control never queues or
+    # rejects and the timings are of signups, not of 503s
+    os.environ['SIGNUP_MAX_IN_FLIGHT'] = str(concurrency)
+    os.environ['SIGNUP_QUEUE_SIZE'] = str(concurrency)
+
+    import app as app_module
+    app_module.MAX_REGISTRATIONS = max_registrations
+    app_module.init_db(mongo_client)
+    result = app_module.app.test_cli_runner().invoke(args=['init-db'])
+    if result.exit_code != 0:
+        raise RuntimeError(f"init-db failed: {result.output}")
+    return app_module
+
+
+def start_wsgi_server(flask_app):
+    """Serve the app with Werkzeug's threaded WSGI server on a free local port"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, flask_app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def start_asgi_server(asgi_app):
+    """Serve an ASGI app with uvicorn (one event loop) on a free local port"""
+    import uvicorn
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(asgi_app, host='127.0.0.1', port=port, log_level='warning',
+                                           access_log=False, backlog=4096))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f'http://127.0.0.1:{port}'
+
+
+# ========== SCENARIOS ==========
+
+def user_form(i):
+    return {
+        'name': 'Bench Participant',
+        'email': f'bench{i}@example.com',
+        'password': BENCHMARK_PASSWORD,
+        'phone': f'7{i:09d}',
+        'college': 'Benchmark Institute of Technology',
+        'department': 'CSE',
+        'year': '3',
+        'foodPriority': 'veg',
+        'transactionId': f'BENCHTXN{i:08d}',
+        'g-recaptcha-response': 'benchmark',
+    }
+
+
+def build_request(route, i, users):
+    """(method, path, kwargs) for the i-th request of a route"""
+    if route == 'register':
+        return 'POST', '/api/register', {'data': user_form(i)}
+    if route == 'login':
+        return 'POST', '/api/login', {'json': {'email': users[i % len(users)]['email'], 'password': BENCHMARK_PASSWORD}}
+    if route == 'check-email':
+        # Half hits, half misses
+        email = users[i % len(users)]['email'] if i % 2 else f'nobody{i}@example.com'
+        return 'POST', '/api/check-email', {'json': {'email': email}}
+    if route == 'validate-epoch-id':
+        ids = [users[(i + k) % len(users)]['epochId'] for k in range(3)]
+        return 'POST', '/api/validate-epoch-id', {'json': {'epochIds': ids}}
+    if route == 'register-event':
+        # Every three requests share a team of three fresh users, who enter two
+        # technical events and one non-technical one - exactly the per-user
+        # limits, so with enough seeded users none of them is refused
+        team_index, entry = divmod(i, 3)
+        events = [
+            TECH_EVENTS[team_index % len(TECH_EVENTS)],
+            TECH_EVENTS[(team_index + 1) % len(TECH_EVENTS)],
+            NONTECH_EVENTS[team_index % len(NONTECH_EVENTS)],
+        ]
+        event_id = events[entry]
+        team = {
+            f'participant{k + 1}': {'epochId': users[(team_index * 3 + k) % len(users)]['epochId'], 'name': 'Bench Participant'}
+            for k in range(3)
+        }
+        return 'POST', '/api/register-event', {'json': {'eventId': event_id, 'eventName': event_id, 'teamName': f'Team {i}', **team}}
+    if route == 'registration-status':
+        return 'GET', '/api/registration-status', {}
+    if route == 'health':
+        return 'GET', '/api/health', {}
+    raise ValueError(f'Unknown route: {route}')
+
+
+def run_route(base_url, build, total, concurrency, counter=None):
+    """
+    Fire `total` requests with `concurrency` client threads
+
+    Args:
+        build: Callable i -> (method, path, kwargs) for the i-th request
+        counter: CommandCounter used to attribute MongoDB commands to this run
+
+    Returns:
+        (summary dict, list of (latency_ms, status, json_body) in request order)
+    """
+    local = threading.local()
+
+    def one(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, kwargs = build(i)
+        started = time.perf_counter()
+        reply = session.request(method, base_url + path, timeout=60, **kwargs)
+        latency_ms = (time.perf_counter() - started) * 1000
+        body = reply.json() if reply.headers.get('Content-Type', '').startswith('application/json') else None
+        return latency_ms, reply.status_code, body
+
+    ops_before = counter.count if counter else None
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    mongo_ops = counter.count - ops_before if counter else None
+
+    summary = summarise([r[0] for r in results], [r[1] for r in results], elapsed, mongo_ops)
+    return summary, results
+
+
+# ========== LOAD TEST ==========
+
+def compare_runs(current, baseline, tolerance):
+    """Print per-route p95/throughput changes and return the routes that regressed"""
+    regressions = []
+    print(f"\n{'route':<22} {'p95 ms (base → now)':>26} {'rps (base → now)':>24}")
+    for route, now in current['routes'].items():
+        base = baseline.get('routes', {}).get(route)
+        if not base or base.get('p95Ms') is None or now.get('p95Ms') is None:
+            continue
+        p95_change = (now['p95Ms'] - base['p95Ms']) / base['p95Ms'] if base['p95Ms'] else 0
+        rps_change = (base['throughputRps'] - now['throughputRps']) / base['throughputRps'] if base['throughputRps'] else 0
+        flag = ''
+        if p95_change > tolerance or rps_change > tolerance:
+            regressions.append(route)
+            flag = '  ⚠️ regression'
+        print(f"{route:<22} {base['p95Ms']:>11.1f} → {now['p95Ms']:<11.1f} "
+              f"{base['throughputRps']:>10.1f} → {now['throughputRps']:<10.1f}{flag}")
+    return regressions
+
+
+def load_command(args):
+    counter = None
+    if args.backend == 'mongomock':
+        if mongomock is None:
+            sys.exit("mongomock is not installed (pip install mongomock)")
+        mongomock.gridfs.enable_gridfs_integration()
+        mongo_client = mongomock.MongoClient()
+    else:
+        counter = CommandCounter()
+        mongo_client = MongoClient(args.mongo_uri, event_listeners=[counter])
+    mongo_client.drop_database(BENCHMARK_DATABASE)
+
+    routes = args.routes or ROUTES
+    # register-event uses one fresh user per request (see build_request)
+    seed_users = max(args.seed_users, args.requests) if 'register-event' in routes else args.seed_users
+    # Enough slots for the register phase plus the seeded users
+    max_registrations = args.requests + seed_users
+
+    with StubSiteverifyServer(delay=args.recaptcha_delay) as stub:
+        app_module = load_app(mongo_client, stub.url, max_registrations, args.concurrency)
+        server, base_url = start_wsgi_server(app_module.app)
+        try:
+            # Seed the users the other routes log in as and register into events
+            print(f"Seeding {seed_users} users...")
+            seed = lambda i: build_request('register', i, None)
+            _, seed_results = run_route(base_url, seed, seed_users, args.concurrency)
+            users = [
+                {'email': user_form(i)['email'], 'epochId': body['epochId']}
+                for i, (_, status, body) in enumerate(seed_results) if status == 201
+            ]
+            if not users:
+                sys.exit("Seeding failed - no users were registered")
+
+            report = {
+                'timestamp': datetime.utcnow().isoformat(),
+                'revision': git_revision(),
+                'backend': args.backend,
+                'concurrency': args.concurrency,
+                'requestsPerRoute': args.requests,
+                'recaptchaDelaySeconds': args.recaptcha_delay,
+                'routes': {},
+            }
+            for route in routes:
+                print(f"Benchmarking /api/{route} ({args.requests} requests, concurrency {args.concurrency})...")
+                # New signups are numbered after the seeded users so e-mails stay unique
+                offset = seed_users if route == 'register' else 0
+                build = lambda i, route=route, offset=offset: build_request(route, i + offset, users)
+                report['routes'][route], _ = run_route(base_url, build, args.requests, args.concurrency, counter)
+        finally:
+            server.shutdown()
+            mongo_client.drop_database(BENCHMARK_DATABASE)
+
+    print(f"\n{'route':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'ok p95':>8} {'err p95':>8} {'rps':>8} {'ops/req':>8} "
+          f"{'4xx':>5} {'503':>5} {'5xx':>5}")
+    for route, summary in report['routes'].items():
+        ops = summary['mongoOpsPerRequest']
+        print(f"{route:<22} {summary['p50Ms']:>8.1f} {summary['p95Ms']:>8.1f} {summary['p99Ms']:>8.1f} "
+              f"{format_ms(summary['okP95Ms']):>8} {format_ms(summary['errorP95Ms']):>8} "
+              f"{summary['throughputRps']:>8.1f} {ops if ops is None else round(ops, 1)!s:>8} "
+              f"{summary['clientErrors']:>5} {summary['rejected']:>5} {summary['serverErrors']:>5}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_runs(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed routes: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+# ========== WSGI VS ASGI ==========
+
+ASYNC_ROUTES = ['register', 'login', 'check-email', 'registration-status']
+
+
+def async_command(args):
+    """Same signup traffic against the threaded WSGI server and the uvicorn ASGI app"""
+    mongo_client = MongoClient(args.mongo_uri)
+    mongo_client.drop_database(BENCHMARK_DATABASE)
+
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'revision': git_revision(),
+        'concurrency': args.concurrency,
+        'requestsPerRoute': args.requests,
+        'recaptchaDelaySeconds': args.recaptcha_delay,
+        'passwordHashMethod': args.password_hash_method,
+        'servers': {},
+    }
+    with StubSiteverifyServer(delay=args.recaptcha_delay) as stub:
+        app_module = load_app(mongo_client, stub.url, args.requests * 2, args.concurrency)
+        if args.password_hash_method:
+            app_module.password_hasher = PasswordHasher(args.password_hash_method)
+        # api/asgi.py builds its Motor client from MONGODB_URI when it starts
+        app_module.MONGODB_URI = args.mongo_uri
+        from api import asgi
+
+        wsgi_server, wsgi_url = start_wsgi_server(app_module.app)
+        asgi_server, asgi_url = start_asgi_server(asgi.app)
+        try:
+            for index, (name, base_url) in enumerate([('wsgi', wsgi_url), ('asgi', asgi_url)]):
+                results = report['servers'][name] = {}
+                # Each server signs up its own block of users
+                offset = index * args.requests
+                print(f"[{name}] /api/register ({args.requests} requests, concurrency {args.concurrency})...")
+                build = lambda i: build_request('register', i + offset, None)
+                results['register'], replies = run_route(base_url, build, args.requests, args.concurrency)
+                users = [
+                    {'email': user_form(i + offset)['email'], 'epochId': body['epochId']}
+                    for i, (_, status, body) in enumerate(replies) if status == 201
+                ]
+                if not users:
+                    sys.exit(f"[{name}] no signups succeeded")
+
+                for route in args.routes:
+                    if route == 'register':
+                        continue
+                    print(f"[{name}] /api/{route}...")
+                    build = lambda i, route=route: build_request(route, i, users)
+                    results[route], _ = run_route(base_url, build, args.requests, args.concurrency)
+        finally:
+            asgi_server.should_exit = True
+            wsgi_server.shutdown()
+            mongo_client.drop_database(BENCHMARK_DATABASE)
+
+    print(f"\n{'route':<22} {'server':<6} {'p50':>8} {'p95':>8} {'p99':>8} {'ok p95':>8} {'err p95':>8} {'rps':>8} "
+          f"{'4xx':>5} {'503':>5} {'5xx':>5}")
+    for route in ['register'] + [r for r in args.routes if r != 'register']:
+        for name, results in report['servers'].items():
+            summary = results[route]
+            print(f"{route:<22} {name:<6} {summary['p50Ms']:>8.1f} {summary['p95Ms']:>8.1f} "
+                  f"{summary['p99Ms']:>8.1f} {format_ms(summary['okP95Ms']):>8} {format_ms(summary['errorP95Ms']):>8} "
+                  f"{summary['throughputRps']:>8.1f} "
+                  f"{summary['clientErrors']:>5} {summary['rejected']:>5} {summary['serverErrors']:>5}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+# ========== PASSWORD HASHING ==========
+
+def hashing_command(args):
+    """Logins/sec (password verifications) for each hash method and pool size"""
+    rows = []
+    for method in args.methods:
+        for workers in args.workers:
+            hasher = PasswordHasher(method, workers=workers)
+            stored = hasher.hash(BENCHMARK_PASSWORD)
+            # Warm the pool so process start-up is not counted
+            hasher.verify(stored, BENCHMARK_PASSWORD)
+
+            def one(_):
+                started = time.perf_counter()
+                hasher.verify(stored, BENCHMARK_PASSWORD)
+                return (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                latencies = sorted(pool.map(one, range(args.logins)))
+            elapsed = time.perf_counter() - started
+            hasher.close()
+
+            rows.append({
+                'method': hasher.method_prefix,
+                'workers': workers,
+                'loginsPerSecond': args.logins / elapsed,
+                'p50Ms': percentile(latencies, 50),
+                'p95Ms': percentile(latencies, 95),
+            })
+
+    print(f"\n{'method':<26} {'workers':>7} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in rows:
+        print(f"{row['method']:<26} {row['workers']:>7} {row['loginsPerSecond']:>9.1f} "
+              f"{row['p50Ms']:>8.1f} {row['p95Ms']:>8.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'timestamp': datetime.utcnow().isoformat(), 'concurrency': args.concurrency,
+                       'results': rows}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+# ========== RATE LIMITER ==========
+
+def ratelimit_command(args):
+    """Microseconds the rate limiter adds to each request, per backend and thread count"""
+    backends = [('memory', MemoryBackend)]
+    if args.redis_url:
+        backends.append(('redis', lambda: RedisBackend.from_url(args.redis_url, prefix='epoch:ratelimit:bench:')))
+
+    rows = []
+    for name, make_backend in backends:
+        for threads in args.threads:
+            hits = args.hits if name == 'memory' else args.hits // 20
+            micros = benchmark_limiter(make_backend(), keys=args.keys, hits=hits, threads=threads)
+            rows.append({'backend': name, 'threads': threads, 'microsPerCheck': micros})
+
+    print(f"\n{'backend':<10} {'threads':>7} {'µs/check':>10}")
+    for row in rows:
+        print(f"{row['backend']:<10} {row['threads']:>7} {row['microsPerCheck']:>10.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'timestamp': datetime.utcnow().isoformat(), 'keys': args.keys, 'results': rows}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EPOCH 2026 API benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('load', help='Latency/throughput of every /api route')
+    load.add_argument('--backend', choices=['mongod', 'mongomock'], default='mongod')
+    load.add_argument('--mongo-uri', default='mongodb://localhost:27017')
+    load.add_argument('--concurrency', type=int, default=16)
+    load.add_argument('--requests', type=int, default=200, help='Requests per route')
+    load.add_argument('--seed-users', type=int, default=60,
+                      help='Users registered before the run (at least --requests when register-event is benchmarked)')
+    load.add_argument('--routes', nargs='+', choices=ROUTES)
+    load.add_argument('--recaptcha-delay', type=float, default=0.0, help='Simulated siteverify latency (s)')
+    load.add_argument('--output', help='Write results to this JSON file')
+    load.add_argument('--compare', help='Baseline JSON file to compare against')
+    load.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95/throughput drift before failing')
+    load.set_defaults(handler=load_command)
+
+    hashing = commands.add_parser('hashing', help='Login throughput per password hash cost')
+    hashing.add_argument('--methods', nargs='+',
+                         default=['scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:260000'])
+    hashing.add_argument('--workers', nargs='+', type=int, default=[0], help='Process pool sizes to try')
+    hashing.add_argument('--concurrency', type=int, default=8)
+    hashing.add_argument('--logins', type=int, default=64, help='Verifications per configuration')
+    hashing.add_argument('--output', help='Write results to this JSON file')
+    hashing.set_defaults(handler=hashing_command)
+
+    compare_async = commands.add_parser('async', help='Threaded WSGI vs api/asgi.py under concurrent signups')
+    compare_async.add_argument('--mongo-uri', default='mongodb://localhost:27017')
+    compare_async.add_argument('--concurrency', type=int, default=128)
+    compare_async.add_argument('--requests', type=int, default=400, help='Requests per route and server')
+    compare_async.add_argument('--routes', nargs='+', choices=ASYNC_ROUTES, default=ASYNC_ROUTES)
+    compare_async.add_argument('--recaptcha-delay', type=float, default=0.3, help='Simulated siteverify latency (s)')
+    compare_async.add_argument('--password-hash-method',
+                               help='Override PASSWORD_HASH_METHOD, e.g. a cheap one so I/O waits dominate')
+    compare_async.add_argument('--output', help='Write results to this JSON file')
+    compare_async.set_defaults(handler=async_command)
+
+    ratelimit = commands.add_parser('ratelimit', help='Per-request overhead of the rate limiter')
+    ratelimit.add_argument('--threads', nargs='+', type=int, default=[1, 8])
+    ratelimit.add_argument('--keys', type=int, default=1000, help='Distinct clients')
+    ratelimit.add_argument('--hits', type=int, default=200000, help='Checks per configuration (1/20th for Redis)')
+    ratelimit.add_argument('--redis-url', help='Also measure a Redis-compatible server')
+    ratelimit.add_argument('--output', help='Write results to this JSON file')
+    ratelimit.set_defaults(handler=ratelimit_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+EPOCH 2026 - Bulk import
+On-spot registrations collected offline, imported from CSV in one go:
+validate every row with the signup rules, reserve one contiguous block of EPOCH
+numbers, hash in parallel and insert with ordered insert_many batches.
+Optional team rows name participants by EPOCH ID or by e-mail, so teams can
+reference people imported in the same run.
+"""
+
+import csv
+import time
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+import storage
+from events import event_counter
+from fingerprint import normalise_transaction_id
+from payments import payment_rejected, payment_review
+from stats import record_event_stats, update_stats, user_stats_increments
+from validation import validate_registration
+
+IMPORT_BATCH_SIZE = 100
+
+
+def read_csv_rows(stream):
+    """(line number, row dict) for every non-blank CSV row, with headers and values stripped"""
+    reader = csv.DictReader(stream)
+    rows = []
+    for row in reader:
+        cleaned = {(key or '').strip(): (value or '').strip() for key, value in row.items() if key}
+        if any(cleaned.values()):
+            rows.append((reader.line_num, cleaned))
+    return rows
+
+
+def insert_users_in_order(user_docs, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Insert with ordered insert_many batches, resuming after any row that fails
+
+    Returns:
+        Dict of index into user_docs -> error message for rows that were not inserted
+    """
+    failed = {}
+    for start in range(0, len(user_docs), batch_size):
+        batch = user_docs[start:start + batch_size]
+        position = 0
+        while position < len(batch):
+            try:
+                storage.users_collection.insert_many(batch[position:], ordered=True)
+                break
+            except BulkWriteError as e:
+                error = e.details['writeErrors'][0]
+                failed_at = position + error['index']
+                failed[start + failed_at] = (
+                    'Email already registered' if error.get('code') == 11000 else error.get('errmsg', 'Insert failed')
+                )
+                position = failed_at + 1
+    return failed
+
+
+class RegistrationImporter:
+    """
+    Import user rows, then optional team rows, and report row by row
+
+    Args:
+        password_hasher: passwords.PasswordHasher; the whole file is hashed with hash_many()
+        max_registrations: Highest EPOCH number that may be handed out
+        on_users_created: Called with the inserted user documents (for in-process caches)
+    """
+
+    def __init__(self, password_hasher, max_registrations, on_users_created=None):
+        self.password_hasher = password_hasher
+        self.max_registrations = max_registrations
+        self.on_users_created = on_users_created
+
+    def reserve_epoch_block(self, count):
+        """Reserve up to `count` contiguous EPOCH numbers; returns (first number, how many)"""
+        for _ in range(3):
+            if count <= 0:
+                return None, 0
+            first = storage.allocate_epoch_number(self.max_registrations, count)
+            if first is not None:
+                return first, count
+            # Not enough left for everyone - take whatever is still free
+            count = min(count, self.max_registrations - storage.issued_epoch_numbers())
+        return None, 0
+
+    def import_users(self, rows, dry_run=False):
+        """
+        Validate and import user rows
+
+        Returns:
+            (report dict, email -> EPOCH ID for the users created)
+        """
+        users_collection = storage.users_collection
+        failures = []
+        valid = []
+        seen = set()
+        for line, row in rows:
+            errors = validate_registration(row)
+            email = row.get('email', '').lower()
+            if not errors and email in seen:
+                errors = {'email': 'Duplicate email in this file'}
+            if errors:
+                failures.append({'row': line, 'email': email, 'errors': errors})
+                continue
+            seen.add(email)
+            valid.append((line, row))
+
+        # One query for every address already registered
+        existing = {
+            user['email'] for user in
+            users_collection.find({'email': {'$in': [row['email'].lower() for _, row in valid]}}, {'_id': 0, 'email': 1})
+        }
+        # Reused transaction IDs, against the database and earlier rows of the file
+        transaction_keys = [normalise_transaction_id(row['transactionId']) for _, row in valid]
+        paid_with = {}
+        for user in users_collection.find({'transactionIdKey': {'$in': transaction_keys}}, {'_id': 0, 'epochId': 1, 'transactionIdKey': 1}):
+            paid_with.setdefault(user['transactionIdKey'], []).append(user.get('epochId'))
+
+        candidates = []
+        reviews = {}
+        for (line, row), transaction_key in zip(valid, transaction_keys):
+            if row['email'].lower() in existing:
+                failures.append({'row': line, 'email': row['email'].lower(), 'errors': {'email': 'Email already registered'}})
+                continue
+            matches = [{'epochId': epoch_id, 'reasons': ['transactionId']} for epoch_id in paid_with.get(transaction_key, [])]
+            if payment_rejected(matches):
+                failures.append({'row': line, 'email': row['email'].lower(), 'errors': {'transactionId': 'Payment already used for another registration'}})
+                continue
+            if matches:
+                reviews[line] = payment_review(matches)
+            # Later rows are checked against this one; its line number stands in for the EPOCH ID until allocation
+            paid_with.setdefault(transaction_key, []).append(line)
+            candidates.append((line, row))
+
+        report = {'rows': len(rows), 'imported': 0, 'users': [], 'failed': failures}
+        if dry_run or not candidates:
+            report['valid'] = len(candidates)
+            return report, {}
+
+        first_number, reserved = self.reserve_epoch_block(len(candidates))
+        for line, row in candidates[reserved:]:
+            failures.append({'row': line, 'email': row['email'].lower(), 'errors': {'epochId': 'Registration full'}})
+        candidates = candidates[:reserved]
+        if not candidates:
+            return report, {}
+
+        password_hashes = self.password_hasher.hash_many([row['password'] for _, row in candidates])
+        user_docs = []
+        for offset, ((_, row), password_hash) in enumerate(zip(candidates, password_hashes)):
+            user_doc = storage.build_user_doc(row, password_hash, first_number + offset)
+            user_doc['importedAt'] = user_doc['createdAt']
+            user_docs.append(user_doc)
+
+        epoch_ids_by_line = {line: user_doc['epochId'] for (line, _), user_doc in zip(candidates, user_docs)}
+        for (line, _), user_doc in zip(candidates, user_docs):
+            if line not in reviews:
+                continue
+            # Rows that did not get a number are not registrations to compare with
+            review = reviews[line]
+            review['matches'] = [
+                epoch_ids_by_line.get(match, match) for match in review['matches']
+                if not isinstance(match, int) or match in epoch_ids_by_line
+            ]
+            if review['matches']:
+                user_doc['paymentReview'] = review
+
+        failed = insert_users_in_order(user_docs)
+        created = {}
+        inserted = []
+        stats = {}
+        for index, ((line, row), user_doc) in enumerate(zip(candidates, user_docs)):
+            if index in failed:
+                failures.append({'row': line, 'email': user_doc['email'], 'errors': {'email': failed[index]}})
+                continue
+            created[user_doc['email']] = user_doc['epochId']
+            inserted.append(user_doc)
+            report['users'].append({'row': line, 'email': user_doc['email'], 'epochId': user_doc['epochId']})
+            for key, amount in user_stats_increments(user_doc).items():
+                stats[key] = stats.get(key, 0) + amount
+
+        report['imported'] = len(created)
+        if inserted:
+            update_stats(stats)
+            if self.on_users_created:
+                self.on_users_created(inserted)
+        failures.sort(key=lambda failure: failure['row'])
+        return report, created
+
+    def import_team(self, row, epoch_ids_by_email):
+        """
+        Register one team row (eventId, eventName, teamName, paperTitle, participant1-3)
+
+        Returns:
+            (registration ID, None) on success or (None, error message)
+        """
+        users_collection = storage.users_collection
+        event_id = row.get('eventId', '')
+        if event_id not in storage.event_collections:
+            return None, f'Invalid event: {event_id}'
+
+        epoch_ids = []
+        for i in range(1, 4):
+            reference = row.get(f'participant{i}', '')
+            if not reference:
+                continue
+            if '@' in reference:
+                epoch_id = epoch_ids_by_email.get(reference.lower())
+                if epoch_id is None:
+                    user = users_collection.find_one({'email': reference.lower()}, {'_id': 0, 'epochId': 1})
+                    epoch_id = user.get('epochId') if user else None
+                if epoch_id is None:
+                    return None, f'No registered user with email {reference}'
+            else:
+                epoch_id = reference.upper()
+            epoch_ids.append(epoch_id)
+        if not epoch_ids:
+            return None, 'At least one participant required'
+
+        # Participant entries carry the same details the registration form collects
+        users = {
+            user['epochId']: user for user in users_collection.find(
+                {'epochId': {'$in': epoch_ids}},
+                {'_id': 0, 'epochId': 1, 'name': 1, 'college': 1, 'phone': 1}
+            )
+        }
+        missing = [epoch_id for epoch_id in epoch_ids if epoch_id not in users]
+        if missing:
+            return None, f"Invalid EPOCH IDs: {', '.join(missing)}"
+
+        registration_time = datetime.utcnow()
+        registration_id = storage.generate_registration_id(event_id, registration_time)
+        registration_doc = {
+            'registrationId': registration_id,
+            'eventId': event_id,
+            'eventName': row.get('eventName') or event_id,
+            'teamName': row.get('teamName', ''),
+            'paperTitle': row.get('paperTitle', '') if event_id == 'paper-presentation' else None,
+            'participants': [
+                {
+                    'epochId': epoch_id,
+                    'name': users[epoch_id].get('name', ''),
+                    'college': users[epoch_id].get('college', ''),
+                    'mobile': users[epoch_id].get('phone', '')
+                }
+                for epoch_id in epoch_ids
+            ],
+            'participantEpochIds': epoch_ids,
+            'registrationTime': registration_time,
+            'status': 'confirmed',
+            'importedAt': registration_time
+        }
+        event_collection = storage.event_collections[event_id]
+        result = event_collection.insert_one(registration_doc)
+
+        counter_field, max_events = event_counter(event_id)
+        if counter_field:
+            try:
+                over_limit = storage.apply_event_counters(epoch_ids, counter_field, max_events, registration_id)
+            except Exception:
+                event_collection.delete_one({'_id': result.inserted_id})
+                raise
+            if over_limit:
+                event_collection.delete_one({'_id': result.inserted_id})
+                return None, f'{over_limit[0]} has reached the event limit'
+
+        record_event_stats(event_id, len(epoch_ids))
+        return registration_id, None
+
+    def run(self, user_rows, team_rows=None, dry_run=False):
+        """Import users, then teams; returns the full report"""
+        started = time.perf_counter()
+        report, created = self.import_users(user_rows, dry_run=dry_run)
+        report['dryRun'] = dry_run
+
+        if team_rows is not None:
+            teams = report['teams'] = {'rows': len(team_rows), 'imported': 0, 'registrations': [], 'failed': []}
+            if not dry_run:
+                for line, row in team_rows:
+                    try:
+                        registration_id, error = self.import_team(row, created)
+                    except Exception as e:
+                        registration_id, error = None, f'Error: {e}'
+                    if error:
+                        teams['failed'].append({'row': line, 'teamName': row.get('teamName', ''), 'error': error})
+                    else:
+                        teams['registrations'].append({'row': line, 'teamName': row.get('teamName', ''), 'registrationId': registration_id})
+                teams['imported'] = len(teams['registrations'])
+
+        if not dry_run and (report['imported'] or report.get('teams', {}).get('imported')):
+            storage.bump_data_version()
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        return report
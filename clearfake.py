@@ -1,12 +1,25 @@
 """
 Script to delete fake registrations from MongoDB
 Identifies fake registrations based on patterns observed in the data
+
+Usage:
+    python clearfake.py              # interactive menu
+    python clearfake.py --dry-run    # report only
+    python clearfake.py --delete     # delete users, their event registrations and screenshots
 """
 
-from pymongo import MongoClient
-import re
+import argparse
+import time
+from collections import Counter
+
+from pymongo import MongoClient, UpdateMany
 from urllib.parse import quote_plus
 
+import storage
+from events import event_counter
+from stats import event_stats_increments, update_stats, user_stats_increments
+from validation import FIELD_RULES
+
 # MongoDB connection - URL encode username and password for special characters
 username = quote_plus("mohantwo3_db_user")
 password = quote_plus("Techiee@2k24")  # URL encode the password (@ symbol needs encoding)
@@ -17,116 +30,178 @@ client = MongoClient(MONGODB_URI)
 db = client['epoch_2026']  # Correct database name from app.py
 collection = db['users']  # Your collection name
 
-def identify_fake_registrations():
+# Same collection handles as the app (separate or unified event storage, GridFS bucket)
+storage.connect(db)
+
+# A record is fake when any of these rules from validation.py fails
+FAKE_RULES = {'name_fake', 'email_fake', 'phone_fake'}
+SCORED_FIELDS = ['name', 'email', 'phone', 'college', 'transactionId']
+SCAN_PROJECTION = {field: 1 for field in SCORED_FIELDS + ['epochId', 'foodPriority', 'paymentScreenshotId', 'createdAt']}
+AFFECTED_PROJECTION = {'registrationId': 1, 'eventId': 1, 'participantEpochIds': 1}
+
+BATCH_SIZE = 500
+
+
+def score_record(record):
+    """
+    Run the shared validation rules over a user record
+
+    Returns:
+        Names of every failed rule. The record is fake if any of them is in FAKE_RULES.
     """
-    Identify fake registrations based on observed patterns:
-    1. Names like "user1", "user21", "user22" etc.
-    2. Emails like "user21@mail.com" pattern
-    3. Phone numbers with pattern like 9800000021, 9800000022 (sequential)
-    4. Generic test data patterns
+    failed = []
+    for field in SCORED_FIELDS:
+        value = record.get(field)
+        if not isinstance(value, str) or not value:
+            continue
+        normalise, rules = FIELD_RULES[field]
+        value = normalise(value)
+        failed.extend(rule.name for rule in rules if rule.is_invalid(value))
+    return failed
+
+
+def scan_users(batch_size=BATCH_SIZE):
     """
-    
-    fake_patterns = {
-        # Pattern 1: Names that are just "user" followed by numbers
-        "name_pattern": re.compile(r'^user\d+$', re.IGNORECASE),
-        
-        # Pattern 2: Emails with userXX@mail.com pattern
-        "email_pattern": re.compile(r'^user\d+@mail\.com$', re.IGNORECASE),
-        
-        # Pattern 3: Phone numbers with suspicious sequential patterns (980000000X)
-        "phone_pattern": re.compile(r'^98000000\d{2}$'),
-    }
-    
-    # Query to find fake registrations using $or for multiple conditions
-    fake_query = {
-        "$or": [
-            # Match names like "user1", "user21", etc.
-            {"name": {"$regex": r"^user\d+$", "$options": "i"}},
-            
-            # Match emails like "user21@mail.com"
-            {"email": {"$regex": r"^user\d+@mail\.com$", "$options": "i"}},
-            
-            # Match phone numbers with pattern 98000000XX
-            {"phone": {"$regex": r"^98000000\d{2}$"}},
-            
-            # Additional patterns for test/fake data
-            {"name": {"$regex": r"^test\d*$", "$options": "i"}},
-            {"email": {"$regex": r"^test\d*@", "$options": "i"}},
-        ]
+    Stream every user (projected) and yield batches of (record, failed rules)
+
+    Patterns are evaluated in Python rather than as unanchored case-insensitive
+    $regex queries, which cannot use an index and scan every document anyway.
+    """
+    batch = []
+    for record in collection.find({}, SCAN_PROJECTION, batch_size=batch_size):
+        batch.append((record, score_record(record)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def delete_batch(records):
+    """
+    Delete one batch of fake users and everything hanging off them
+
+    Teammates' counters are released first and only while the registration ID is
+    still in their registeredEvents, so a batch interrupted half way can simply be
+    re-run. Users are deleted last for the same reason. Registrations and users
+    are removed one at a time with find_one_and_delete, so the stats are only
+    decremented for documents this run actually removed (a concurrent run, or an
+    earlier attempt, may already have deleted some).
+
+    Returns:
+        Dict with registrations, teammates, screenshots and users removed/updated
+    """
+    fake_ids = {record['epochId'] for record in records if record.get('epochId')}
+    affected = storage.find_registrations_for_users(fake_ids, AFFECTED_PROJECTION)
+
+    # Release the event slot of every real teammate of a removed team
+    counter_updates = []
+    for _, registration in affected:
+        field, _ = event_counter(registration.get('eventId'))
+        teammates = [eid for eid in registration.get('participantEpochIds', []) if eid not in fake_ids]
+        if not teammates:
+            continue
+        update = {'$pull': {'registeredEvents': registration['registrationId']}}
+        if field:
+            update['$inc'] = {field: -1}
+        counter_updates.append(UpdateMany(
+            {'epochId': {'$in': teammates}, 'registeredEvents': registration['registrationId']},
+            update
+        ))
+    teammates_updated = 0
+    if counter_updates:
+        teammates_updated = collection.bulk_write(counter_updates, ordered=False).modified_count
+
+    # Keep the dashboard summary in step (flask rebuild-stats reconciles it fully)
+    stats = Counter()
+
+    registrations_deleted = 0
+    for registrations, registration in affected:
+        if registrations.find_one_and_delete({'_id': registration['_id']}, {'_id': 1}) is None:
+            continue
+        registrations_deleted += 1
+        stats.subtract(event_stats_increments(registration.get('eventId'), len(registration.get('participantEpochIds', []))))
+
+    users_deleted = 0
+    screenshots_deleted = 0
+    for record in records:
+        if collection.find_one_and_delete({'_id': record['_id']}, {'_id': 1}) is None:
+            continue
+        users_deleted += 1
+        stats.subtract(user_stats_increments(record))
+        if record.get('paymentScreenshotId'):
+            storage.delete_payment_screenshot(record['paymentScreenshotId'])
+            screenshots_deleted += 1
+
+    if users_deleted or registrations_deleted:
+        update_stats(dict(stats))
+        storage.bump_data_version()
+
+    return {
+        'users': users_deleted,
+        'registrations': registrations_deleted,
+        'teammates': teammates_updated,
+        'screenshots': screenshots_deleted
     }
-    
-    return fake_query
 
-def preview_fake_registrations():
-    """Preview fake registrations before deletion"""
-    fake_query = identify_fake_registrations()
-    
-    print("=" * 60)
-    print("FAKE REGISTRATIONS FOUND (Preview)")
-    print("=" * 60)
-    
-    fake_records = list(collection.find(fake_query))
-    
-    if not fake_records:
-        print("No fake registrations found!")
-        return []
-    
-    for i, record in enumerate(fake_records, 1):
-        print(f"\n--- Record {i} ---")
-        print(f"  ID: {record.get('_id')}")
-        print(f"  Name: {record.get('name')}")
-        print(f"  Email: {record.get('email')}")
-        print(f"  Phone: {record.get('phone')}")
-        print(f"  College: {record.get('college')}")
-        print(f"  Epoch ID: {record.get('epochId')}")
-        print(f"  Created At: {record.get('createdAt')}")
-    
-    print(f"\n{'=' * 60}")
-    print(f"Total fake registrations found: {len(fake_records)}")
-    print("=" * 60)
-    
-    return fake_records
 
-def delete_fake_registrations(dry_run=True):
+def run_cleanup(dry_run=True, batch_size=BATCH_SIZE, show=20):
     """
-    Delete fake registrations
-    
+    Scan for fake registrations and (unless dry_run) delete them batch by batch
+
     Args:
-        dry_run: If True, only shows what would be deleted without actually deleting
+        dry_run: Only report what would be removed
+        batch_size: Users per cursor batch and per delete batch
+        show: How many flagged records to print in the report
     """
-    fake_query = identify_fake_registrations()
-    
+    print("\n[DRY RUN MODE] - No actual deletion will occur" if dry_run else "\n[DELETION MODE] - Removing fake registrations...")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    scanned = 0
+    flagged = 0
+    reasons = Counter()
+    totals = Counter()
+
+    for batch in scan_users(batch_size):
+        scanned += len(batch)
+        batch = [(record, failed) for record, failed in batch if FAKE_RULES.intersection(failed)]
+        if not batch:
+            continue
+        for record, failed in batch:
+            flagged += 1
+            reasons.update(failed)
+            if flagged <= show:
+                print(f"  {record.get('epochId', '-'):<10} {record.get('name')!s:<24} {record.get('email')!s:<32} "
+                      f"{record.get('phone')!s:<12} {', '.join(failed)}")
+
+        records = [record for record, _ in batch]
+        if dry_run:
+            fake_ids = [record['epochId'] for record in records if record.get('epochId')]
+            totals['registrations'] += len(storage.find_registrations_for_users(fake_ids, AFFECTED_PROJECTION))
+            totals['screenshots'] += sum(1 for record in records if record.get('paymentScreenshotId'))
+        else:
+            totals.update(delete_batch(records))
+
+    elapsed = time.perf_counter() - started
+
+    if flagged > show:
+        print(f"  ... and {flagged - show} more")
+    print("=" * 60)
+    print(f"Scanned {scanned} users in {elapsed:.2f}s ({scanned / elapsed if elapsed else 0:.0f} records/sec)")
+    print(f"Fake registrations: {flagged}")
+    for rule_name, count in reasons.most_common():
+        print(f"  {rule_name:<20} {count}")
     if dry_run:
-        print("\n[DRY RUN MODE] - No actual deletion will occur")
-        fake_records = preview_fake_registrations()
-        
-        if fake_records:
-            print("\nTo actually delete these records, run with dry_run=False")
-        return
-    
-    # Actual deletion
-    print("\n[DELETION MODE] - Removing fake registrations...")
-    
-    # First, get count and preview
-    count = collection.count_documents(fake_query)
-    
-    if count == 0:
-        print("No fake registrations found to delete!")
-        return
-    
-    print(f"Found {count} fake registrations to delete.")
-    
-    # Confirm deletion
-    confirm = input(f"\nAre you sure you want to delete {count} fake registrations? (yes/no): ")
-    
-    if confirm.lower() != 'yes':
-        print("Deletion cancelled.")
-        return
-    
-    # Perform deletion
-    result = collection.delete_many(fake_query)
-    
-    print(f"\n✅ Successfully deleted {result.deleted_count} fake registrations!")
+        print(f"Event registrations that would be removed: {totals['registrations']}")
+        print(f"Payment screenshots that would be removed: {totals['screenshots']}")
+        if flagged:
+            print("\nTo actually delete these records, run with --delete")
+    else:
+        print(f"✅ Deleted {totals['users']} users, {totals['registrations']} event registrations, "
+              f"{totals['screenshots']} screenshots; released slots for {totals['teammates']} teammates")
+    return flagged
+
 
 def main():
     print("\n" + "=" * 60)
@@ -153,15 +228,17 @@ def main():
     choice = input("\nEnter your choice (1/2/3/4): ").strip()
     
     if choice == '1':
-        preview_fake_registrations()
+        run_cleanup(dry_run=True)
     elif choice == '2':
         # First do a dry run
         print("\nFirst, let's preview what will be deleted...")
-        preview_fake_registrations()
+        flagged = run_cleanup(dry_run=True)
+        if not flagged:
+            return
         
-        proceed = input("\nProceed with deletion? (yes/no): ")
+        proceed = input(f"\nDelete {flagged} fake registrations and their event registrations? (yes/no): ")
         if proceed.lower() == 'yes':
-            delete_fake_registrations(dry_run=False)
+            run_cleanup(dry_run=False)
         else:
             print("Deletion cancelled.")
     elif choice == '3':
@@ -181,7 +258,16 @@ def main():
         print("Invalid choice!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Find and remove fake registrations')
+    parser.add_argument('--dry-run', action='store_true', help='Report fake registrations and exit')
+    parser.add_argument('--delete', action='store_true', help='Delete without the interactive menu')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    
+    if args.dry_run or args.delete:
+        run_cleanup(dry_run=not args.delete, batch_size=args.batch_size)
+    else:
+        main()
     
     # Close connection
     client.close()
@@ -0,0 +1,50 @@
+"""
+EPOCH 2026 - Event catalogue
+Event IDs, per-user event limits and where each event's registrations are stored
+"""
+
+import os
+
+# Event registration storage: 'separate' keeps one collection per event (below),
+# 'unified' stores every event in UNIFIED_EVENT_COLLECTION, keyed by eventId.
+# Run 'flask --app app migrate-event-registrations' before switching to unified.
+EVENT_STORAGE = os.getenv('EVENT_STORAGE', 'separate').lower()
+UNIFIED_EVENT_COLLECTION = 'event_registrations'
+
+# Event registration collections
+EVENT_COLLECTION_NAMES = {
+    'paper-presentation': 'paper_presentation_registrations',
+    'binary-battle': 'binary_battle_registrations',
+    'prompt-arena': 'prompt_arena_registrations',
+    'connection': 'connection_registrations',
+    'flipflop': 'flipflop_registrations'
+}
+
+# Event configuration
+TECH_EVENTS = ['paper-presentation', 'binary-battle', 'prompt-arena']
+REGISTRATION_ID_PREFIXES = {
+    'paper-presentation': 'PPT',
+    'binary-battle': 'BBT',
+    'prompt-arena': 'PMA',
+    'connection': 'CON',
+    'flipflop': 'FLP'
+}
+NONTECH_EVENTS = ['connection', 'flipflop']
+MAX_TECH_EVENTS_PER_USER = 2
+MAX_NONTECH_EVENTS_PER_USER = 1
+
+
+def event_counter(event_id):
+    """(user counter field, per-user limit) for an event, or (None, None) if it counts against neither"""
+    if event_id in TECH_EVENTS:
+        return 'technicalEventsCount', MAX_TECH_EVENTS_PER_USER
+    if event_id in NONTECH_EVENTS:
+        return 'nonTechnicalEventsCount', MAX_NONTECH_EVENTS_PER_USER
+    return None, None
+
+
+def event_collections_for(database):
+    """Event ID -> collection in `database` for the configured EVENT_STORAGE"""
+    if EVENT_STORAGE == 'unified':
+        return {event_id: database[UNIFIED_EVENT_COLLECTION] for event_id in EVENT_COLLECTION_NAMES}
+    return {event_id: database[name] for event_id, name in EVENT_COLLECTION_NAMES.items()}
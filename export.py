@@ -0,0 +1,104 @@
+"""
+EPOCH 2026 - Organiser export
+One row per participant with their user details joined in by a $lookup.
+Rows are streamed from the aggregation cursor, so memory stays flat however
+large the event is. The joined user fields are an inclusion projection, so the
+password hash and screenshot data never leave the database.
+"""
+
+import csv
+import io
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+import storage
+from events import EVENT_COLLECTION_NAMES
+
+EXPORT_COLUMNS = [
+    'registrationId', 'eventId', 'eventName', 'teamName', 'paperTitle', 'registrationTime',
+    'participantNumber', 'epochId', 'name', 'email', 'phone', 'college', 'department',
+    'yearOfStudy', 'foodPriority'
+]
+
+
+def export_pipeline(event_id):
+    """Aggregation producing flat export rows for one event"""
+    return [
+        {'$match': storage.event_query(event_id)},
+        # Registration order, straight from the registrationId index (see storage.py)
+        {'$sort': {'registrationId': 1}},
+        {'$unwind': {'path': '$participants', 'includeArrayIndex': 'participantIndex'}},
+        {'$lookup': {
+            'from': storage.users_collection.name,
+            'localField': 'participants.epochId',
+            'foreignField': 'epochId',
+            'pipeline': [{'$project': {
+                '_id': 0, 'name': 1, 'email': 1, 'phone': 1, 'college': 1,
+                'department': 1, 'yearOfStudy': 1, 'foodPriority': 1
+            }}],
+            'as': 'user'
+        }},
+        {'$unwind': {'path': '$user', 'preserveNullAndEmptyArrays': True}},
+        {'$project': {
+            '_id': 0,
+            'registrationId': 1,
+            'eventId': 1,
+            'eventName': 1,
+            'teamName': 1,
+            'paperTitle': 1,
+            'registrationTime': 1,
+            'participantNumber': {'$add': ['$participantIndex', 1]},
+            'epochId': '$participants.epochId',
+            # Fall back to what was typed on the event form if the user is gone
+            'name': {'$ifNull': ['$user.name', '$participants.name']},
+            'email': '$user.email',
+            'phone': {'$ifNull': ['$user.phone', '$participants.mobile']},
+            'college': {'$ifNull': ['$user.college', '$participants.college']},
+            'department': '$user.department',
+            'yearOfStudy': '$user.yearOfStudy',
+            'foodPriority': '$user.foodPriority'
+        }}
+    ]
+
+
+def iter_export_rows(event_ids):
+    """Yield export rows (lists in EXPORT_COLUMNS order) for the given events"""
+    for event_id in event_ids:
+        cursor = storage.event_collections[event_id].aggregate(export_pipeline(event_id), batchSize=500)
+        for row in cursor:
+            yield [row.get(column, '') if row.get(column) is not None else '' for column in EXPORT_COLUMNS]
+
+
+def iter_export_csv(event_ids, rows_per_chunk=200):
+    """Yield the CSV export in text chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(iter_export_rows(event_ids), 1):
+        writer.writerow(row)
+        if i % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_export_xlsx(event_ids, path):
+    """Write the export to an .xlsx file using openpyxl's constant-memory writer"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Registrations')
+    sheet.append(EXPORT_COLUMNS)
+    for row in iter_export_rows(event_ids):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def resolve_export_events(requested):
+    """Validate requested event IDs (all events when none are given)"""
+    unknown = [event_id for event_id in requested if event_id not in EVENT_COLLECTION_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown event(s): {', '.join(unknown)}")
+    return list(requested) or list(EVENT_COLLECTION_NAMES)
@@ -0,0 +1,113 @@
+"""
+EPOCH 2026 - Payment fingerprints
+Content and perceptual hashes of payment screenshots, and normalised transaction IDs
+
+Receipts from one payment app share a template, so at 8x8 the dHash of two
+different payments is usually within a bit or two of each other: it only picks
+candidates. The detail hash is a dHash on a fine, blurred grid that keeps the
+amount and ID digits apart; a look-alike must be close on both (payments.py).
+"""
+
+import hashlib
+import io
+import re
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:
+    Image = None
+
+# False without Pillow: screenshots then only match byte for byte (sha256)
+PERCEPTUAL_HASHING = Image is not None
+
+# dHash grid: HASH_SIZE x HASH_SIZE gradient bits (64)
+HASH_SIZE = 8
+
+# The 64-bit dHash is split into BANDS pieces that are indexed separately. Two
+# hashes within BANDS - 1 bits of each other share at least one band exactly,
+# so an index lookup on the bands finds every near-duplicate candidate.
+BANDS = 8
+
+# Detail hash grid (portrait, like a phone screenshot) and the brightness step a
+# gradient needs before it counts, so JPEG noise on flat backgrounds does not flip bits
+DETAIL_WIDTH = 48
+DETAIL_HEIGHT = 104
+DETAIL_MIN_STEP = 2
+
+# Refuse to decode anything larger (a 100KB PNG can still declare huge dimensions)
+MAX_PIXELS = 25_000_000
+
+NON_ALPHANUMERIC = re.compile(r'[^0-9A-Z]')
+
+
+def normalise_transaction_id(transaction_id):
+    """'txn 4412-0098 ' -> 'TXN44120098', so spacing and case variants compare equal"""
+    return NON_ALPHANUMERIC.sub('', (transaction_id or '').upper())
+
+
+def gradient_hash(pixels, width, height, min_step=0):
+    """Hex dHash of a (width + 1) x height greyscale image: one bit per left-to-right step"""
+    bits = 0
+    for row in range(height):
+        offset = row * (width + 1)
+        for column in range(width):
+            bits = (bits << 1) | (pixels[offset + column] > pixels[offset + column + 1] + min_step)
+    return f'{bits:0{width * height // 4}x}'
+
+
+def perceptual_hashes(content):
+    """
+    (dHash as 16 hex digits, detail hash) of an image
+
+    Returns:
+        (None, None) when Pillow is not installed or the bytes are not a readable image
+    """
+    if Image is None:
+        return None, None
+    detail_size = ((DETAIL_WIDTH + 1) * 6, DETAIL_HEIGHT * 6)
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            if image.width * image.height > MAX_PIXELS:
+                return None, None
+            # JPEG decoders can scale down while decoding, which is much cheaper
+            image.draft('L', detail_size)
+            grey = image.convert('L')
+            small = grey.resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR).tobytes()
+            detail = (grey.resize(detail_size, Image.BILINEAR)
+                      .filter(ImageFilter.GaussianBlur(1))
+                      .resize((DETAIL_WIDTH + 1, DETAIL_HEIGHT), Image.BILINEAR)
+                      .tobytes())
+    except Exception:
+        return None, None
+    return (
+        gradient_hash(small, HASH_SIZE, HASH_SIZE),
+        gradient_hash(detail, DETAIL_WIDTH, DETAIL_HEIGHT, DETAIL_MIN_STEP)
+    )
+
+
+def dhash_bands(hex_hash):
+    """Index keys for a dHash: ['0:a3', '1:07', ...] (band number keeps equal pieces in different positions apart)"""
+    if not hex_hash:
+        return []
+    width = len(hex_hash) // BANDS
+    return [f'{band}:{hex_hash[band * width:(band + 1) * width]}' for band in range(BANDS)]
+
+
+def hamming_distance(hex_a, hex_b):
+    return bin(int(hex_a, 16) ^ int(hex_b, 16)).count('1')
+
+
+def screenshot_fingerprint(content):
+    """
+    Hashes stored with a screenshot
+
+    Returns:
+        {'sha256': hex, 'dhash': hex or None, 'bands': [...], 'detail': hex or None}
+    """
+    perceptual, detail = perceptual_hashes(content)
+    return {
+        'sha256': hashlib.sha256(content).hexdigest(),
+        'dhash': perceptual,
+        'bands': dhash_bands(perceptual),
+        'detail': detail
+    }
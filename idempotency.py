@@ -0,0 +1,91 @@
+"""
+EPOCH 2026 - Idempotency keys
+Clients send an Idempotency-Key header with each submission. The first request
+with a key claims it; a successful (2xx) response is stored and replayed for
+any repeat, so double-clicks and retries never register twice. Failed attempts
+release the key so the client can simply try again. A claim still pending
+after IDEMPOTENCY_PENDING_TTL belongs to a request that died; the next retry
+takes it over.
+
+The record layout and the decisions live here. app.idempotent (pymongo) and
+api/asgi.py's idempotent (Motor) only make the database calls, so a key
+claimed through either entry point is honoured by the other.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+# How long (seconds) a successful response is replayed for a repeated Idempotency-Key,
+# and how long an unfinished request holds its key if the worker dies mid-request
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))
+IDEMPOTENCY_PENDING_TTL = int(os.getenv('IDEMPOTENCY_PENDING_TTL', '120'))
+
+MAX_KEY_LENGTH = 128
+
+INVALID_KEY = {
+    'success': False,
+    'message': 'Invalid Idempotency-Key'
+}
+
+IN_PROGRESS = {
+    'success': False,
+    'message': 'This request is already being processed. Please wait a moment.',
+    'inProgress': True
+}
+
+REPLAYED_HEADERS = {'Idempotent-Replayed': 'true'}
+
+
+def request_key(headers):
+    """The Idempotency-Key header, stripped ('' when absent)"""
+    return headers.get('Idempotency-Key', '').strip()
+
+
+def record_id(path, key):
+    return f'{path}:{key}'
+
+
+def pending_record(record_id):
+    """Claim for a request that is being processed now"""
+    now = datetime.utcnow()
+    return {
+        '_id': record_id,
+        'state': 'pending',
+        'createdAt': now,
+        'expiresAt': now + timedelta(seconds=IDEMPOTENCY_PENDING_TTL)
+    }
+
+
+def stale_claim_takeover(record_id):
+    """
+    (filter, update) that re-claims a pending record whose holder ran out of time
+
+    A worker that dies mid-request leaves its claim behind until the TTL monitor
+    gets round to it (or forever, without the TTL index). Only one retry can win
+    the find_one_and_update, so the request still runs at most once at a time.
+    """
+    claim = pending_record(record_id)
+    del claim['_id']
+    return {'_id': record_id, 'state': 'pending', 'expiresAt': {'$lt': claim['createdAt']}}, {'$set': claim}
+
+
+def stored_response(record):
+    """(body, status code) to replay for a completed record, None while it is pending"""
+    if record and record.get('state') == 'completed':
+        return record['body'], record['statusCode']
+    return None
+
+
+def should_store(status_code):
+    """Only successes are replayed; anything else releases the key"""
+    return 200 <= status_code < 300
+
+
+def completed_update(status_code, body):
+    """Update that turns the pending record into a replayable response"""
+    return {'$set': {
+        'state': 'completed',
+        'statusCode': status_code,
+        'body': body,
+        'expiresAt': datetime.utcnow() + timedelta(seconds=IDEMPOTENCY_TTL)
+    }}
@@ -898,6 +898,24 @@ function generatePlayerNumber() {
     return Math.floor(Math.random() * 456) + 1;
 }
 
+// Idempotency key for an API submission. Submitting the same payload again
+// (double-click, retry after a timeout) reuses the key, so the server replays
+// the first response instead of registering twice.
+const idempotencyKeys = {};
+
+function getIdempotencyKey(scope, payload) {
+    const entry = idempotencyKeys[scope];
+    if (entry && entry.payload === payload) {
+        return entry.key;
+    }
+
+    const key = (window.crypto && crypto.randomUUID)
+        ? crypto.randomUUID()
+        : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    idempotencyKeys[scope] = { payload, key };
+    return key;
+}
+
 // ============================================
 // 12. Lazy Loading
 // ============================================
@@ -632,6 +632,13 @@ async function handleEventRegistration() {
 
             const validateResult = await validateResponse.json();
 
+            if (validateResponse.status === 429) {
+                submitBtn.disabled = false;
+                submitBtn.innerHTML = originalText;
+                showToast(validateResult.message, 'error');
+                return;
+            }
+
             if (!validateResult.valid) {
                 submitBtn.disabled = false;
                 submitBtn.innerHTML = originalText;
@@ -651,12 +658,14 @@ async function handleEventRegistration() {
     try {
         submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Registering...';
 
+        const payload = JSON.stringify(formData);
         const registerResponse = await fetch('/api/register-event', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Idempotency-Key': getIdempotencyKey('register-event', payload)
             },
-            body: JSON.stringify(formData)
+            body: payload
         });
 
         const registerResult = await registerResponse.json();
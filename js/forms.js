@@ -49,22 +49,41 @@ async function handleRegistration(e) {
         // Create FormData for file upload
         const formDataObj = new FormData(form);
 
+        // Same form contents -> same idempotency key (the reCAPTCHA token is left out
+        // because it changes on every attempt)
+        const submission = JSON.stringify([...formDataObj.entries()].map(
+            ([name, value]) => [name, value instanceof File ? `${value.name}:${value.size}` : value]
+        ));
+
         // Add reCAPTCHA response to FormData
         formDataObj.append('g-recaptcha-response', recaptchaResponse);
 
-        // Call Flask API
-        const response = await fetch('/api/register', {
-            method: 'POST',
-            body: formDataObj
-        });
+        // Call Flask API. While signups are queued the server answers 503 with a
+        // queue ticket; sending the same form again with it after retryAfter
+        // seconds keeps our place in line.
+        const headers = { 'Idempotency-Key': getIdempotencyKey('register', submission) };
+        let result;
+        while (true) {
+            const response = await fetch('/api/register', {
+                method: 'POST',
+                headers,
+                body: formDataObj
+            });
 
-        // Check if response is JSON
-        const contentType = response.headers.get('content-type');
-        if (!contentType || !contentType.includes('application/json')) {
-            throw new Error('Server returned an invalid response. Please try again or contact support.');
-        }
+            // Check if response is JSON
+            const contentType = response.headers.get('content-type');
+            if (!contentType || !contentType.includes('application/json')) {
+                throw new Error('Server returned an invalid response. Please try again or contact support.');
+            }
 
-        const result = await response.json();
+            result = await response.json();
+            if (response.status !== 503 || !result.queueTicket) {
+                break;
+            }
+            headers['X-Queue-Ticket'] = result.queueTicket;
+            submitBtn.innerHTML = `<i class="fas fa-spinner fa-spin"></i> In queue (position ${result.queuePosition})...`;
+            await new Promise(resolve => setTimeout(resolve, result.retryAfter * 1000));
+        }
 
         if (!result.success) {
             // Check if registration is closed
@@ -1614,6 +1633,13 @@ async function handleEventRegistration() {
 
             const validateResult = await validateResponse.json();
 
+            if (validateResponse.status === 429) {
+                submitBtn.disabled = false;
+                submitBtn.innerHTML = originalText;
+                showToast(validateResult.message, 'error');
+                return;
+            }
+
             if (!validateResult.valid) {
                 submitBtn.disabled = false;
                 submitBtn.innerHTML = originalText;
@@ -1632,10 +1658,14 @@ async function handleEventRegistration() {
     try {
         submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Registering...';
 
+        const payload = JSON.stringify(formData);
         const registerResponse = await fetch('/api/register-event', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(formData)
+            headers: {
+                'Content-Type': 'application/json',
+                'Idempotency-Key': getIdempotencyKey('register-event', payload)
+            },
+            body: payload
         });
 
         const registerResult = await registerResponse.json();
@@ -0,0 +1,191 @@
+"""
+EPOCH 2026 - Request metrics
+In-process histograms for handler, MongoDB and reCAPTCHA time, rendered as Prometheus text
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+# Seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Commands per request
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, label_names, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series['buckets']):
+                    labels = _format_labels(self.label_names + ('le',), label_values + (bound,))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.label_names + ('le',), label_values + ('+Inf',))
+                lines.append(f'{self.name}_bucket{labels} {series["count"]}')
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f'{self.name}_sum{labels} {series["sum"]}')
+                lines.append(f'{self.name}_count{labels} {series["count"]}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, label_values)} {value}')
+        return lines
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Adds up MongoDB commands and their server round-trip time per request
+
+    pymongo publishes command events on the thread that issued the command, so
+    totals are kept per thread and reset at the start of every request.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def reset(self):
+        self._local.commands = 0
+        self._local.seconds = 0.0
+
+    def totals(self):
+        """(command count, seconds) since the last reset() on this thread"""
+        return getattr(self._local, 'commands', 0), getattr(self._local, 'seconds', 0.0)
+
+    def started(self, event):
+        self._local.commands = getattr(self._local, 'commands', 0) + 1
+
+    def succeeded(self, event):
+        self._local.seconds = getattr(self._local, 'seconds', 0.0) + event.duration_micros / 1e6
+
+    def failed(self, event):
+        self._local.seconds = getattr(self._local, 'seconds', 0.0) + event.duration_micros / 1e6
+
+
+class RequestMetrics:
+    """The histograms the API exports at /api/metrics"""
+
+    def __init__(self):
+        self.mongo_timer = MongoCommandTimer()
+        self._local = threading.local()
+
+        self.requests = Counter(
+            'epoch_http_requests_total', 'Requests handled, by route and status',
+            ['route', 'method', 'status'])
+        self.handler_seconds = Histogram(
+            'epoch_http_request_duration_seconds', 'Handler wall time',
+            ['route', 'method'])
+        self.mongo_commands = Histogram(
+            'epoch_mongo_commands_per_request', 'MongoDB commands issued per request',
+            ['route'], buckets=COUNT_BUCKETS)
+        self.mongo_seconds = Histogram(
+            'epoch_mongo_duration_seconds', 'Time spent waiting on MongoDB per request',
+            ['route'])
+        self.stage_seconds = Histogram(
+            'epoch_request_stage_seconds', 'Time spent in named stages (recaptcha, password hashing, ...)',
+            ['route', 'stage'])
+
+    def start_request(self):
+        """Reset the per-thread totals; call at the start of every request"""
+        self.mongo_timer.reset()
+        self._local.stages = {}
+        self._local.started = time.perf_counter()
+
+    def record_stage(self, stage, seconds):
+        """Attribute time to a named stage of the current request"""
+        stages = getattr(self._local, 'stages', None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage):
+        """Time the enclosed block as a stage of the current request"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def finish_request(self, route, method, status):
+        """Record everything measured for the request that just finished"""
+        started = getattr(self._local, 'started', None)
+        if started is None:
+            return
+        self._local.started = None
+
+        commands, mongo_seconds = self.mongo_timer.totals()
+        self.mongo_commands.observe(commands, route)
+        self.mongo_seconds.observe(mongo_seconds, route)
+        self.observe_request(route, method, status, time.perf_counter() - started, self._local.stages)
+
+    def observe_request(self, route, method, status, seconds, stages=None):
+        """
+        Record a request timed by the caller
+
+        The async routes use this directly: their MongoDB calls run on driver
+        threads, so only the handler time and stages are attributed to them.
+        """
+        self.requests.inc(route, method, str(status))
+        self.handler_seconds.observe(seconds, route, method)
+        for stage, stage_seconds in (stages or {}).items():
+            self.stage_seconds.observe(stage_seconds, route, stage)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in (self.requests, self.handler_seconds, self.mongo_commands,
+                       self.mongo_seconds, self.stage_seconds):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,111 @@
+"""
+EPOCH 2026 - Password hashing
+Configurable Werkzeug hash method/cost, optionally offloaded to a bounded process pool
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """
+    Hash and verify passwords with a configured Werkzeug method
+
+    With workers > 0 the CPU-heavy work runs in a process pool so it does not
+    hold the GIL while other requests are being served. At most
+    workers * queue_factor jobs are queued; further callers wait for a slot.
+    If the pool cannot start (e.g. no /dev/shm on serverless hosts) hashing
+    falls back to the calling thread.
+
+    Args:
+        method: Werkzeug method string, e.g. 'scrypt', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000'
+        workers: Process pool size (0 = hash inline on the request thread)
+        timeout: Seconds to wait for a pooled job before giving up
+    """
+
+    def __init__(self, method='scrypt', workers=0, timeout=10.0, queue_factor=4):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+
+        self._method_prefix = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, workers * queue_factor))
+
+    def _get_pool(self):
+        if self.workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    # spawn: forking a process that already runs pymongo threads is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                except (OSError, NotImplementedError) as e:
+                    print(f"⚠️  Password hashing pool unavailable, hashing inline: {e}")
+                    self.workers = 0
+            return self._pool
+
+    def _run(self, func, *args):
+        pool = self._get_pool()
+        if pool is None:
+            return func(*args)
+        with self._slots:
+            try:
+                return pool.submit(func, *args).result(timeout=self.timeout)
+            except BrokenProcessPool:
+                with self._pool_lock:
+                    self._pool = None
+                return func(*args)
+
+    def hash(self, password):
+        """Hash a password with the configured method"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords in parallel (bulk imports)
+
+        Uses the process pool when one is configured, otherwise a thread per core;
+        hashlib releases the GIL while it runs scrypt/pbkdf2, so threads scale too.
+        """
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return list(pool.map(generate_password_hash, passwords, itertools.repeat(self.method), chunksize=8))
+            except BrokenProcessPool:
+                with self._pool_lock:
+                    self._pool = None
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as threads:
+            return list(threads.map(generate_password_hash, passwords, itertools.repeat(self.method)))
+
+    def verify(self, stored_hash, password):
+        """Check a password against a stored hash (any method Werkzeug understands)"""
+        return self._run(check_password_hash, stored_hash, password)
+
+    @property
+    def method_prefix(self):
+        """The exact prefix Werkzeug writes for the configured method, e.g. 'scrypt:32768:8:1'"""
+        if self._method_prefix is None:
+            # Worked out on first use so importing the app does not pay for a hash
+            self._method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, stored_hash):
+        """True when a stored hash was made with different method or cost settings"""
+        return stored_hash.split('$', 1)[0] != self.method_prefix
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
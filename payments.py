@@ -0,0 +1,106 @@
+"""
+EPOCH 2026 - Reused payments
+Find earlier registrations that share a transaction ID or payment screenshot,
+and decide whether a new registration is flagged for review or refused
+"""
+
+import os
+from datetime import datetime
+
+import storage
+from fingerprint import BANDS, hamming_distance
+
+# Reused payments (same transaction ID or screenshot as an earlier registration):
+# 'flag' stores the registration with a paymentReview note for the organisers
+# (one person may pay for a whole team), 'reject' refuses it with a 409.
+# A screenshot counts as a look-alike when its dHash is within
+# SCREENSHOT_MATCH_DISTANCE bits (kept below fingerprint.BANDS so the band index
+# finds every candidate) AND its detail hash is within DETAIL_MATCH_DISTANCE bits.
+# The dHash alone cannot tell receipts of one payment app apart: on synthetic
+# GPay/PhonePe-style receipts every pair of different payments was within 5 bits.
+# Their detail hashes were at least 24 bits apart, while the same receipt
+# re-saved as JPEG (quality 40-70), scaled or greyed stayed within 24 (16 at
+# quality 70); 20 leaves a margin on the side of not flagging. Records hashed
+# before the detail hash existed never match as look-alikes until
+# 'flask hash-screenshots' has backfilled them.
+PAYMENT_DUPLICATE_ACTION = os.getenv('PAYMENT_DUPLICATE_ACTION', 'flag').lower()
+SCREENSHOT_MATCH_DISTANCE = min(int(os.getenv('SCREENSHOT_MATCH_DISTANCE', '5')), BANDS - 1)
+DETAIL_MATCH_DISTANCE = int(os.getenv('DETAIL_MATCH_DISTANCE', '20'))
+
+PAYMENT_MATCH_PROJECTION = {'_id': 0, 'epochId': 1, 'transactionIdKey': 1, 'paymentScreenshotHash': 1}
+PAYMENT_MATCH_LIMIT = 50
+
+
+def payment_match_queries(transaction_key, screenshot_hash=None):
+    """
+    Filters for earlier registrations that may share this payment
+
+    Exact matches (transaction ID, identical bytes) are a separate query from the
+    dHash band candidates, so a crowd of look-alike screenshots from the same
+    payment app cannot push them past PAYMENT_MATCH_LIMIT.
+    """
+    exact = []
+    if transaction_key:
+        exact.append({'transactionIdKey': transaction_key})
+    if screenshot_hash:
+        exact.append({'paymentScreenshotHash.sha256': screenshot_hash['sha256']})
+    queries = [{'$or': exact}] if exact else []
+    if screenshot_hash and screenshot_hash['bands']:
+        queries.append({'paymentScreenshotHash.bands': {'$in': screenshot_hash['bands']}})
+    return queries
+
+
+def looks_alike(stored, screenshot_hash):
+    """Both the coarse dHash and the detail hash are close"""
+    if not (stored.get('dhash') and stored.get('detail') and screenshot_hash['dhash'] and screenshot_hash.get('detail')):
+        return False
+    return (hamming_distance(stored['dhash'], screenshot_hash['dhash']) <= SCREENSHOT_MATCH_DISTANCE and
+            hamming_distance(stored['detail'], screenshot_hash['detail']) <= DETAIL_MATCH_DISTANCE)
+
+
+def classify_payment_matches(users, transaction_key, screenshot_hash=None):
+    """
+    Keep the candidates that really match, with the reasons
+
+    Returns:
+        [{'epochId': ..., 'reasons': ['transactionId', 'screenshot' or 'similarScreenshot']}]
+    """
+    matches = {}
+    for user in users:
+        reasons = []
+        if transaction_key and user.get('transactionIdKey') == transaction_key:
+            reasons.append('transactionId')
+        stored = user.get('paymentScreenshotHash') or {}
+        if screenshot_hash and stored:
+            if stored.get('sha256') == screenshot_hash['sha256']:
+                reasons.append('screenshot')
+            elif looks_alike(stored, screenshot_hash):
+                reasons.append('similarScreenshot')
+        if reasons:
+            matches[user.get('epochId')] = {'epochId': user.get('epochId'), 'reasons': reasons}
+    return list(matches.values())
+
+
+def find_payment_matches(transaction_key, screenshot_hash=None):
+    """Earlier registrations that reuse this transaction ID or screenshot"""
+    candidates = []
+    for query in payment_match_queries(transaction_key, screenshot_hash):
+        candidates.extend(storage.users_collection.find(query, PAYMENT_MATCH_PROJECTION).limit(PAYMENT_MATCH_LIMIT))
+    return classify_payment_matches(candidates, transaction_key, screenshot_hash)
+
+
+def payment_rejected(matches):
+    """True if PAYMENT_DUPLICATE_ACTION refuses these matches (look-alike screenshots are only ever flagged)"""
+    return PAYMENT_DUPLICATE_ACTION == 'reject' and any(
+        reason != 'similarScreenshot' for match in matches for reason in match['reasons']
+    )
+
+
+def payment_review(matches):
+    """'paymentReview' note stored on a registration that reuses an earlier payment"""
+    return {
+        'status': 'pending',
+        'reasons': sorted({reason for match in matches for reason in match['reasons']}),
+        'matches': [match['epochId'] for match in matches],
+        'flaggedAt': datetime.utcnow()
+    }
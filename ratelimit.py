@@ -0,0 +1,186 @@
+"""
+EPOCH 2026 - Rate limiting
+Sliding-window request limits with an in-process or Redis-compatible backend
+"""
+
+import math
+import threading
+import time
+
+
+def parse_rate(text):
+    """'20/60' -> (20 requests, 60.0 seconds)"""
+    limit, _, window = text.partition('/')
+    return int(limit), float(window or 60)
+
+
+def client_address(forwarded_for, peer, trusted_hops=0):
+    """
+    The caller's address for per-IP limits
+
+    Each proxy appends the address it received the request from to
+    X-Forwarded-For, so with `trusted_hops` proxies in front of the app the
+    client is that many entries from the right. Anything further left was sent
+    by the client and can be made up. With no trusted proxies, or fewer entries
+    than expected, the socket peer address is used.
+    """
+    if trusted_hops > 0 and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(',')]
+        if len(hops) >= trusted_hops and hops[-trusted_hops]:
+            return hops[-trusted_hops]
+    return peer or 'unknown'
+
+
+class MemoryBackend:
+    """
+    Window counters in a dict - state is per process
+
+    Args:
+        max_keys: Expired counters are swept (at most once a second) while more keys than this are tracked
+    """
+
+    def __init__(self, max_keys=50000):
+        self.max_keys = max_keys
+        self._windows = {}
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def hit(self, key, window, now):
+        """Count one request; returns (this window's count, previous window's count)"""
+        index = int(now // window)
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = self._windows[key] = [index, 0, 0, window]
+            elif entry[0] == index - 1:
+                entry = self._windows[key] = [index, 0, entry[1], window]
+            entry[1] += 1
+            current, previous = entry[1], entry[2]
+
+            if len(self._windows) > self.max_keys and now >= self._next_sweep:
+                self._sweep(now)
+        return current, previous
+
+    def peek(self, key, window, now):
+        """(this window's count, previous window's count) without counting anything"""
+        index = int(now // window)
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                return 0, 0
+            if entry[0] == index - 1:
+                return 0, entry[1]
+            return entry[1], entry[2]
+
+    def _sweep(self, now):
+        # A counter older than the previous window no longer affects any decision
+        expired = [key for key, (index, _, _, window) in self._windows.items() if index < int(now // window) - 1]
+        for key in expired:
+            del self._windows[key]
+        self._next_sweep = now + 1.0
+
+
+class RedisBackend:
+    """
+    Window counters in Redis (or any server speaking its protocol), shared by all workers
+
+    Args:
+        client: A redis.Redis instance
+        prefix: Namespace for the counter keys
+    """
+
+    def __init__(self, client, prefix='epoch:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5), **kwargs)
+
+    def hit(self, key, window, now):
+        index = int(now // window)
+        current_key = f'{self.prefix}{key}:{index}'
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, int(math.ceil(window * 2)))
+        pipe.get(f'{self.prefix}{key}:{index - 1}')
+        current, _, previous = pipe.execute()
+        return int(current), int(previous or 0)
+
+    def peek(self, key, window, now):
+        index = int(now // window)
+        current, previous = self.client.mget(f'{self.prefix}{key}:{index}', f'{self.prefix}{key}:{index - 1}')
+        return int(current or 0), int(previous or 0)
+
+
+class SlidingWindowLimiter:
+    """
+    Allow `limit` requests per key in any `window` seconds
+
+    Uses the sliding-window counter approximation: the previous fixed window's
+    count is weighted by how much of it still overlaps the sliding window. Two
+    integers per key, and rejected requests count too, so hammering keeps a
+    client blocked. check() asks without counting, for limits that only count
+    some outcomes (failed logins) with hit().
+
+    Args:
+        name: Keeps this limiter's keys apart from other limiters on the same backend
+        backend: MemoryBackend or RedisBackend
+    """
+
+    def __init__(self, name, backend, limit, window):
+        self.name = name
+        self.backend = backend
+        self.limit = limit
+        self.window = window
+
+    def hit(self, key):
+        """
+        Count a request for `key`
+
+        Returns:
+            0 if it is allowed, otherwise the seconds to wait before retrying
+        """
+        now = time.time()
+        current, previous = self.backend.hit(f'{self.name}:{key}', self.window, now)
+        return self._retry_after(current, previous, now)
+
+    def check(self, key):
+        """
+        Whether one more request for `key` would be allowed, without counting it
+
+        Returns:
+            0 if it would be, otherwise the seconds to wait before retrying
+        """
+        now = time.time()
+        current, previous = self.backend.peek(f'{self.name}:{key}', self.window, now)
+        return self._retry_after(current + 1, previous, now)
+
+    def _retry_after(self, current, previous, now):
+        into_window = now % self.window
+        estimated = previous * (1 - into_window / self.window) + current
+        if estimated <= self.limit:
+            return 0
+        return max(1, math.ceil(self.window - into_window))
+
+
+# ========== MICRO-BENCHMARK ==========
+
+def benchmark_limiter(backend, keys=1000, hits=100000, threads=1):
+    """Average microseconds per SlidingWindowLimiter.hit() call"""
+    limiter = SlidingWindowLimiter('bench', backend, limit=10**9, window=60)
+
+    def worker(count, offset):
+        for i in range(count):
+            limiter.hit(str((i + offset) % keys))
+
+    per_thread = hits // threads
+    workers = [threading.Thread(target=worker, args=(per_thread, n * 7919)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return elapsed / (per_thread * threads) * 1e6
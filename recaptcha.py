@@ -0,0 +1,181 @@
+"""
+EPOCH 2026 - reCAPTCHA verification
+Pooled keep-alive client for Google's siteverify API and a local stand-in server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_VERIFY_URL = 'https://www.google.com/recaptcha/api/siteverify'
+
+
+class RecaptchaVerifier:
+    """
+    Verify reCAPTCHA tokens over one shared requests.Session
+
+    The session keeps TLS connections to siteverify alive between signups, and
+    every call is bounded by a (connect, read) timeout budget. The latency of
+    each call is recorded for monitoring and benchmarks.
+    """
+
+    def __init__(self, secret, verify_url=DEFAULT_VERIFY_URL, connect_timeout=2.0,
+                 read_timeout=4.0, pool_size=10):
+        self.secret = secret
+        self.verify_url = verify_url
+        self.timeout = (connect_timeout, read_timeout)
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._calls = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def verify(self, response_token):
+        """
+        Ask siteverify about a token
+
+        Returns:
+            The decoded siteverify JSON ({'success': bool, 'error-codes': [...], ...})
+
+        Raises:
+            requests.exceptions.RequestException on connection errors and timeouts
+        """
+        started = time.perf_counter()
+        try:
+            reply = self._session.post(
+                self.verify_url,
+                data={
+                    'secret': self.secret,
+                    'response': response_token
+                },
+                timeout=self.timeout
+            )
+            return reply.json()
+        finally:
+            self._record(time.perf_counter() - started)
+
+    def _record(self, seconds):
+        self._local.last_seconds = seconds
+        with self._lock:
+            self._calls += 1
+            self._total_seconds += seconds
+            self._max_seconds = max(self._max_seconds, seconds)
+
+    @property
+    def last_call_seconds(self):
+        """Duration of the most recent verify() made by the current thread"""
+        return getattr(self._local, 'last_seconds', None)
+
+    def stats(self):
+        """Call count and latency totals since the verifier was created"""
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'totalSeconds': self._total_seconds,
+                'averageSeconds': self._total_seconds / self._calls if self._calls else 0.0,
+                'maxSeconds': self._max_seconds
+            }
+
+    def close(self):
+        self._session.close()
+
+
+class _StubSiteverifyHandler(BaseHTTPRequestHandler):
+    """Answers POST /recaptcha/api/siteverify like Google does"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        token = form.get('response', [''])[0]
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        # Tokens starting with "fail" are rejected so error paths can be exercised
+        if token and not token.startswith('fail'):
+            payload = {
+                'success': True,
+                'challenge_ts': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'hostname': 'localhost'
+            }
+        else:
+            payload = {'success': False, 'error-codes': ['invalid-input-response']}
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # Benchmarks open 100+ connections at once; the default backlog of 5 resets them
+    request_queue_size = 1024
+
+
+class StubSiteverifyServer:
+    """
+    Local stand-in for siteverify, for benchmarks and offline development
+
+    Usage:
+        with StubSiteverifyServer(delay=0.05) as stub:
+            verifier = RecaptchaVerifier('secret', verify_url=stub.url)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0):
+        self._server = _StubHTTPServer((host, port), _StubSiteverifyHandler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/recaptcha/api/siteverify'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a local reCAPTCHA siteverify stand-in')
+    parser.add_argument('--port', type=int, default=8085)
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to wait before answering')
+    args = parser.parse_args()
+
+    stub = StubSiteverifyServer(port=args.port, delay=args.delay)
+    print(f"Stub siteverify listening at {stub.url}")
+    print(f"Set RECAPTCHA_VERIFY_URL={stub.url} to use it")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,159 @@
+"""
+EPOCH 2026 - API response bodies
+JSON bodies of the signup, login and status endpoints, shared by the Flask
+routes (app.py) and their async versions (api/asgi.py) so both answer alike
+"""
+
+import math
+
+# Largest payment screenshot accepted at signup
+MAX_SCREENSHOT_BYTES = 100 * 1024
+
+DATABASE_UNAVAILABLE = {
+    'success': False,
+    'message': 'Database connection not available'
+}
+
+REGISTRATION_CLOSED = {
+    'success': False,
+    'message': 'Registration closed! Maximum 200 registrations have been reached.',
+    'registrationsClosed': True
+}
+
+DUPLICATE_PAYMENT = {
+    'success': False,
+    'message': 'This payment has already been used for another registration. Please contact the organisers.',
+    'duplicatePayment': True
+}
+
+EMAIL_REGISTERED = {
+    'success': False,
+    'message': 'Email already registered. Please login instead.'
+}
+
+RECAPTCHA_MISSING = {
+    'success': False,
+    'message': 'Please complete the reCAPTCHA verification'
+}
+
+RECAPTCHA_FAILED = {
+    'success': False,
+    'message': 'reCAPTCHA verification failed. Please try again.'
+}
+
+RECAPTCHA_UNAVAILABLE = {
+    'success': False,
+    'message': 'Unable to verify reCAPTCHA. Please try again.'
+}
+
+SCREENSHOT_TOO_LARGE = {
+    'success': False,
+    'message': 'Payment screenshot must be less than or equal to 100KB'
+}
+
+REGISTRATION_ERROR = {
+    'success': False,
+    'message': 'An error occurred during registration. Please try again.'
+}
+
+LOGIN_FIELDS_REQUIRED = {
+    'success': False,
+    'message': 'Email and password are required'
+}
+
+INVALID_LOGIN = {
+    'success': False,
+    'message': 'Invalid email or password'
+}
+
+LOGIN_ERROR = {
+    'success': False,
+    'message': 'An error occurred during login. Please try again.'
+}
+
+
+def validation_failed(errors):
+    """400 body for a registration form that failed validation.validate_registration()"""
+    return {
+        'success': False,
+        'message': next(iter(errors.values())),
+        'errors': errors
+    }
+
+
+def registration_succeeded(epoch_number, max_registrations):
+    return {
+        'success': True,
+        'message': 'Registration successful!',
+        'epochId': f"EPOCH{epoch_number:03d}",
+        'registrationNumber': epoch_number,
+        'remainingSlots': max_registrations - epoch_number
+    }
+
+
+def login_succeeded(user):
+    """Login body for a user document read with the auth projection"""
+    return {
+        'success': True,
+        'message': 'Login successful!',
+        'user': {
+            'name': user['name'],
+            'email': user['email'],
+            'epochId': user.get('epochId', 'N/A'),
+            'college': user.get('college', ''),
+            'department': user.get('department', ''),
+            'phone': user.get('phone', '')
+        }
+    }
+
+
+def too_many_attempts(retry_after):
+    return {
+        'success': False,
+        'message': f'Too many attempts. Please try again in {retry_after} seconds.',
+        'retryAfter': retry_after
+    }
+
+
+def signup_queued(rejection):
+    """
+    503 body for an admission.AdmissionRejected
+
+    A client holding `queueTicket` keeps its place by resending the same request
+    with the ticket in the X-Queue-Ticket header after `retryAfter` seconds.
+    """
+    body = {
+        'success': False,
+        'message': f'Registration is very busy right now. Please try again in about {rejection.retry_after} seconds.',
+        'queuePosition': rejection.position,
+        'estimatedWaitSeconds': max(1, math.ceil(rejection.estimated_wait)),
+        'retryAfter': rejection.retry_after
+    }
+    if rejection.ticket:
+        body['queueTicket'] = rejection.ticket
+    return body
+
+
+def status_etag(registered_count, max_registrations):
+    """ETag of the registration status, which only changes with the count"""
+    return f'status-{registered_count}-{max_registrations}'
+
+
+def registration_status(registered_count, max_registrations):
+    is_open = registered_count < max_registrations
+    return {
+        'isOpen': is_open,
+        'totalSlots': max_registrations,
+        'registeredCount': registered_count,
+        'remainingSlots': max_registrations - registered_count,
+        'message': 'Registration open' if is_open else REGISTRATION_CLOSED['message']
+    }
+
+
+def registration_status_unknown(max_registrations):
+    """Status served when the count cannot be read: stay open, the signup route enforces the cap"""
+    return {
+        'isOpen': True,
+        'totalSlots': max_registrations,
+        'remainingSlots': max_registrations
+    }
@@ -0,0 +1,147 @@
+"""
+EPOCH 2026 - Dashboard stats
+A single materialised document (_id 'summary') holding the organiser dashboard
+numbers. Signups and event registrations $inc it as they go; rebuild_stats()
+recomputes it from scratch with one $unionWith/$facet/$merge aggregation. Map
+keys are user-typed values (college names, food preference), so '.' and '$' are
+replaced to keep them valid field names.
+"""
+
+from datetime import datetime
+
+import storage
+from events import EVENT_COLLECTION_NAMES, TECH_EVENTS
+
+STATS_ID = 'summary'
+
+
+def stats_key(value):
+    """Field-name-safe key for a free-text value"""
+    value = (value or '').strip().replace('.', '_').replace('$', '_')
+    return value or 'unknown'
+
+
+def stats_key_expr(field):
+    """Aggregation equivalent of stats_key()"""
+    value = {'$trim': {'input': {'$toString': {'$ifNull': [field, '']}}}}
+    for char in ('.', '$'):
+        value = {'$replaceAll': {'input': value, 'find': {'$literal': char}, 'replacement': '_'}}
+    return {'$let': {
+        'vars': {'key': value},
+        'in': {'$cond': [{'$eq': ['$$key', '']}, 'unknown', '$$key']}
+    }}
+
+
+def stats_update(increments):
+    """(filter, update) applying $inc increments to the summary (run with upsert=True)"""
+    return {'_id': STATS_ID}, {'$inc': increments, '$set': {'updatedAt': datetime.utcnow()}}
+
+
+def update_stats(increments):
+    """Apply $inc increments to the summary - never fails the calling request"""
+    try:
+        storage.stats_collection.update_one(*stats_update(increments), upsert=True)
+    except Exception as e:
+        print(f"Stats update error (run 'flask rebuild-stats' to reconcile): {e}")
+
+
+def user_stats_increments(user_doc):
+    return {
+        'users': 1,
+        f"colleges.{stats_key(user_doc.get('college'))}": 1,
+        f"foodPriority.{stats_key(user_doc.get('foodPriority'))}": 1
+    }
+
+
+def event_stats_increments(event_id, participant_count):
+    participation = 'technical' if event_id in TECH_EVENTS else 'nonTechnical'
+    return {
+        f'events.{event_id}.teams': 1,
+        f'events.{event_id}.participants': participant_count,
+        f'participation.{participation}': participant_count
+    }
+
+
+def record_user_stats(user_doc):
+    update_stats(user_stats_increments(user_doc))
+
+
+def record_event_stats(event_id, participant_count):
+    update_stats(event_stats_increments(event_id, participant_count))
+
+
+def stats_rebuild_pipeline():
+    """Aggregation over users that recomputes the summary and $merges it into stats"""
+    def as_object(field, value):
+        return {'$arrayToObject': {'$map': {'input': field, 'in': {'k': '$$this._id', 'v': value}}}}
+
+    pipeline = [{'$project': {
+        '_id': 0,
+        'kind': {'$literal': 'user'},
+        'college': stats_key_expr('$college'),
+        'foodPriority': stats_key_expr('$foodPriority')
+    }}]
+    for collection in storage.registration_collections():
+        pipeline.append({'$unionWith': {'coll': collection.name, 'pipeline': [{'$project': {
+            '_id': 0,
+            'kind': {'$literal': 'team'},
+            'eventId': 1,
+            'participants': {'$size': {'$ifNull': ['$participants', []]}}
+        }}]}})
+
+    users_only = {'$match': {'kind': 'user'}}
+    teams_only = {'$match': {'kind': 'team'}}
+    pipeline += [
+        {'$facet': {
+            'users': [users_only, {'$count': 'n'}],
+            'colleges': [users_only, {'$group': {'_id': '$college', 'n': {'$sum': 1}}}],
+            'foodPriority': [users_only, {'$group': {'_id': '$foodPriority', 'n': {'$sum': 1}}}],
+            'events': [teams_only, {'$group': {
+                '_id': '$eventId', 'teams': {'$sum': 1}, 'participants': {'$sum': '$participants'}
+            }}],
+            'participation': [teams_only, {'$group': {
+                '_id': {'$cond': [{'$in': ['$eventId', TECH_EVENTS]}, 'technical', 'nonTechnical']},
+                'n': {'$sum': '$participants'}
+            }}]
+        }},
+        {'$project': {
+            '_id': {'$literal': STATS_ID},
+            'users': {'$ifNull': [{'$first': '$users.n'}, 0]},
+            'colleges': as_object('$colleges', '$$this.n'),
+            'foodPriority': as_object('$foodPriority', '$$this.n'),
+            'events': as_object('$events', {'teams': '$$this.teams', 'participants': '$$this.participants'}),
+            'participation': as_object('$participation', '$$this.n'),
+            'updatedAt': '$$NOW'
+        }},
+        {'$merge': {'into': storage.stats_collection.name, 'on': '_id', 'whenMatched': 'replace', 'whenNotMatched': 'insert'}}
+    ]
+    return pipeline
+
+
+def rebuild_stats():
+    """Recompute the summary from users and event registrations"""
+    list(storage.users_collection.aggregate(stats_rebuild_pipeline()))
+
+
+def get_stats_summary():
+    """The summary document with every section present"""
+    summary = storage.stats_collection.find_one({'_id': STATS_ID}, {'_id': 0}) or {}
+    events = summary.get('events', {})
+    participation = summary.get('participation', {})
+    return {
+        'users': summary.get('users', 0),
+        'colleges': summary.get('colleges', {}),
+        'foodPriority': summary.get('foodPriority', {}),
+        'events': {
+            event_id: {
+                'teams': events.get(event_id, {}).get('teams', 0),
+                'participants': events.get(event_id, {}).get('participants', 0)
+            }
+            for event_id in EVENT_COLLECTION_NAMES
+        },
+        'participation': {
+            'technical': participation.get('technical', 0),
+            'nonTechnical': participation.get('nonTechnical', 0)
+        },
+        'updatedAt': summary['updatedAt'].isoformat() if summary.get('updatedAt') else None
+    }
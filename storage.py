@@ -0,0 +1,335 @@
+"""
+EPOCH 2026 - MongoDB storage
+Collection handles and the queries shared by the API, the CLI commands and clearfake.py
+"""
+
+from datetime import datetime
+
+from gridfs import GridFSBucket
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from events import REGISTRATION_ID_PREFIXES, UNIFIED_EVENT_COLLECTION, event_collections_for
+from fingerprint import normalise_transaction_id
+
+# Bound by connect(); None until then (or when the connection failed)
+db = None
+users_collection = None
+counters_collection = None
+screenshots_bucket = None
+idempotency_collection = None
+stats_collection = None
+event_collections = {}
+
+
+def connect(database):
+    """Point every collection handle at `database` (a pymongo Database)"""
+    global db, users_collection, counters_collection, screenshots_bucket
+    global idempotency_collection, stats_collection, event_collections
+
+    db = database
+    users_collection = database['users']
+    counters_collection = database['counters']
+    idempotency_collection = database['idempotency_keys']
+    stats_collection = database['stats']
+
+    # Payment screenshots are kept as raw binary chunks, keyed by epochId
+    screenshots_bucket = GridFSBucket(database, bucket_name='payment_screenshots')
+
+    event_collections = event_collections_for(database)
+
+
+def disconnect():
+    """Drop every handle (after a failed connection)"""
+    global db, users_collection, counters_collection, screenshots_bucket
+    global idempotency_collection, stats_collection, event_collections
+
+    db = None
+    users_collection = None
+    counters_collection = None
+    screenshots_bucket = None
+    idempotency_collection = None
+    stats_collection = None
+    event_collections = {}
+
+
+# ========== USERS ==========
+
+def build_user_doc(data, password_hash, epoch_number, screenshot_id=None, screenshot_hash=None):
+    """User document for a validated registration form"""
+    return {
+        'name': data['name'].strip(),
+        'email': data['email'].lower().strip(),
+        'password': password_hash,
+        'phone': data['phone'].strip(),
+        'college': data['college'].strip(),
+        'department': data['department'].strip(),
+        'yearOfStudy': data['year'].strip(),
+        'foodPriority': data['foodPriority'].strip(),
+        'transactionId': data['transactionId'].strip(),
+        'transactionIdKey': normalise_transaction_id(data['transactionId']),
+        'paymentScreenshotId': screenshot_id,
+        'paymentScreenshotHash': screenshot_hash,
+        'epochId': f"EPOCH{epoch_number:03d}",
+        'epochNumber': epoch_number,
+        'createdAt': datetime.utcnow()
+    }
+
+
+def delete_payment_screenshot(screenshot_id):
+    """Remove a stored screenshot, ignoring failures"""
+    try:
+        screenshots_bucket.delete(screenshot_id)
+    except Exception as e:
+        print(f"Payment screenshot delete error: {e}")
+
+
+# ========== EPOCH ID ALLOCATION ==========
+# EPOCH numbers come from a single counter document ({'_id': 'epochId', 'seq': n})
+# so each signup costs one atomic find-and-modify instead of a scan of all users.
+# A number handed back while it is still the latest one issued simply lowers seq;
+# any other released number goes on the counter's `free` list, which single-number
+# allocations drain before taking a new number. Every free number is below seq,
+# so the two never hand out the same number, and a number popped off the list is
+# only used if no user holds it (a release after an insert that collided on
+# epochId would otherwise put a taken number back into circulation).
+
+EPOCH_ID_COUNTER = 'epochId'
+
+
+def seed_epoch_counter():
+    """Create the EPOCH ID counter from the highest number already in use"""
+    highest = 0
+
+    pipeline = [
+        {'$match': {'epochNumber': {'$exists': True, '$type': 'int'}}},
+        {'$group': {'_id': None, 'maxNum': {'$max': '$epochNumber'}}}
+    ]
+    result = list(users_collection.aggregate(pipeline))
+    if result and result[0].get('maxNum'):
+        highest = result[0]['maxNum']
+
+    # Older users may only carry the epochId string
+    legacy_users = users_collection.find(
+        {'epochId': {'$exists': True}, 'epochNumber': {'$exists': False}},
+        {'epochId': 1}
+    )
+    for user in legacy_users:
+        epoch_id = user.get('epochId', '')
+        if epoch_id.startswith('EPOCH'):
+            try:
+                highest = max(highest, int(epoch_id.replace('EPOCH', '')))
+            except ValueError:
+                pass
+
+    try:
+        counters_collection.update_one(
+            {'_id': EPOCH_ID_COUNTER},
+            {'$setOnInsert': {'seq': highest}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Another worker seeded the counter first
+        pass
+
+
+def allocation_query(limit, count=1):
+    """(filter, update) that takes `count` numbers off the counter while they stay within `limit`"""
+    return {'_id': EPOCH_ID_COUNTER, 'seq': {'$lte': limit - count}}, {'$inc': {'seq': count}}
+
+
+def release_query(number, count=1):
+    """(filter, update) that hands a block back, only while it is still the latest one issued"""
+    return {'_id': EPOCH_ID_COUNTER, 'seq': number + count - 1}, {'$inc': {'seq': -count}}
+
+
+def free_list_push(number, count=1):
+    """(filter, update) that puts a released block on the free list (never a number seq has not reached)"""
+    return (
+        {'_id': EPOCH_ID_COUNTER, 'seq': {'$gte': number + count - 1}},
+        {'$addToSet': {'free': {'$each': list(range(number, number + count))}}}
+    )
+
+
+def free_list_pop():
+    """(filter, update) that takes one number off the free list (run with ReturnDocument.BEFORE)"""
+    return {'_id': EPOCH_ID_COUNTER, 'free.0': {'$exists': True}}, {'$pop': {'free': -1}}
+
+
+def epoch_number_query(number):
+    """Filter for the user holding an EPOCH number (on the unique epochId index)"""
+    return {'epochId': f"EPOCH{number:03d}"}
+
+
+def allocate_epoch_number(limit, count=1):
+    """
+    Reserve the next `count` EPOCH numbers as one contiguous block
+
+    Single numbers are reused from the free list first.
+
+    Returns:
+        The first number of the block, or None if fewer than `count` are left
+        up to `limit`
+    """
+    while count == 1:
+        counter = counters_collection.find_one_and_update(*free_list_pop(), return_document=ReturnDocument.BEFORE)
+        if not counter:
+            break
+        number = counter['free'][0]
+        if not users_collection.count_documents(epoch_number_query(number), limit=1):
+            return number
+
+    for _ in range(2):
+        counter = counters_collection.find_one_and_update(
+            *allocation_query(limit, count),
+            return_document=ReturnDocument.AFTER
+        )
+        if counter:
+            return counter['seq'] - count + 1
+
+        # Either the cap is reached or the counter has not been seeded yet
+        if counters_collection.count_documents({'_id': EPOCH_ID_COUNTER}, limit=1):
+            return None
+        seed_epoch_counter()
+    return None
+
+
+def release_epoch_number(number, count=1):
+    """Hand back a reserved block of EPOCH numbers for reuse"""
+    try:
+        if not counters_collection.update_one(*release_query(number, count)).modified_count:
+            counters_collection.update_one(*free_list_push(number, count))
+    except Exception as e:
+        print(f"EPOCH number release error: {e}")
+
+
+def issued_epoch_numbers():
+    """Highest EPOCH number handed out so far (0 before the first signup)"""
+    counter = counters_collection.find_one({'_id': EPOCH_ID_COUNTER}) or {}
+    return counter.get('seq', 0)
+
+
+# ========== DATA VERSION ==========
+# A change counter bumped by every write to users or event registrations; the
+# version-based ETags in app.py are built from it.
+
+DATA_VERSION_COUNTER = 'dataVersion'
+DATA_VERSION_BUMP = ({'_id': DATA_VERSION_COUNTER}, {'$inc': {'seq': 1}})
+
+
+def data_version():
+    """Current data version (a point read of one counter document)"""
+    counter = counters_collection.find_one({'_id': DATA_VERSION_COUNTER}, {'seq': 1})
+    return counter['seq'] if counter else 0
+
+
+def bump_data_version():
+    """Invalidate every version-based ETag"""
+    try:
+        counters_collection.update_one(*DATA_VERSION_BUMP, upsert=True)
+    except Exception as e:
+        print(f"Data version bump error: {e}")
+
+
+# ========== REGISTRATION IDS ==========
+# Event registration IDs look like PPT-261018143015-0007: event prefix, UTC
+# registration time to the second, then a per-event sequence number from the
+# counters collection. The sequence makes them collision-free without retries,
+# and the fixed-width timestamp makes them sort by time within an event, so the
+# organiser export reads each roster in order from the unique registrationId index.
+
+def next_sequence(name):
+    """Atomically increment and return a named counter, creating it at 1"""
+    counter = counters_collection.find_one_and_update(
+        {'_id': name},
+        {'$inc': {'seq': 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter['seq']
+
+
+def generate_registration_id(event_id, registration_time):
+    """Build the registration ID for a team registered at registration_time (UTC)"""
+    prefix = REGISTRATION_ID_PREFIXES.get(event_id, 'EVT')
+    sequence = next_sequence(f'registration:{event_id}')
+    return f"{prefix}-{registration_time:%y%m%d%H%M%S}-{sequence:04d}"
+
+
+# ========== EVENT REGISTRATION QUERIES ==========
+# Work the same with separate per-event collections and the unified collection.
+
+def registration_collections():
+    """The distinct collections event registrations are stored in"""
+    distinct = {}
+    for collection in event_collections.values():
+        distinct.setdefault(collection.name, collection)
+    return list(distinct.values())
+
+
+def event_query(event_id, query=None):
+    """Scope a registration query to one event (needed when storage is unified)"""
+    query = dict(query or {})
+    if event_collections[event_id].name == UNIFIED_EVENT_COLLECTION:
+        query['eventId'] = event_id
+    return query
+
+
+def find_registrations_for_users(epoch_ids, projection=None):
+    """
+    Every registration any of the EPOCH IDs is part of
+
+    One query per storage collection on the participantEpochIds index.
+
+    Returns:
+        List of (collection, registration) pairs
+    """
+    registrations = []
+    for collection in registration_collections():
+        cursor = collection.find({'participantEpochIds': {'$in': list(epoch_ids)}}, projection)
+        registrations.extend((collection, registration) for registration in cursor)
+    return registrations
+
+
+# ========== EVENT COUNTERS ==========
+
+def apply_event_counters(epoch_ids, counter_field, max_events, registration_id):
+    """
+    Count a new event registration against every participant
+
+    All updates go out as one unordered bulk_write. Each filter only matches while
+    the user is still below max_events, so the limit check and the increment are
+    atomic. If any guard fails, the updates that did apply are undone.
+
+    Returns:
+        List of EPOCH IDs that were already at the limit (empty on success)
+    """
+    unique_ids = list(dict.fromkeys(epoch_ids))
+    operations = [
+        UpdateOne(
+            {'epochId': epoch_id, counter_field: {'$not': {'$gte': max_events}}},
+            {
+                '$inc': {counter_field: 1},
+                '$push': {'registeredEvents': registration_id}
+            }
+        )
+        for epoch_id in unique_ids
+    ]
+    result = users_collection.bulk_write(operations, ordered=False)
+    if result.matched_count == len(operations):
+        return []
+
+    applied = users_collection.find(
+        {'epochId': {'$in': unique_ids}, 'registeredEvents': registration_id},
+        {'_id': 0, 'epochId': 1}
+    )
+    applied_ids = [user['epochId'] for user in applied]
+    if applied_ids:
+        users_collection.update_many(
+            {'epochId': {'$in': applied_ids}, 'registeredEvents': registration_id},
+            {
+                '$inc': {counter_field: -1},
+                '$pull': {'registeredEvents': registration_id}
+            }
+        )
+    return [epoch_id for epoch_id in unique_ids if epoch_id not in applied_ids]
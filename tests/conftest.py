@@ -0,0 +1,81 @@
+"""
+EPOCH 2026 - Test fixtures
+MongoDB is replaced by mongomock (with its GridFS integration), Redis by
+fakeredis and Google's siteverify by recaptcha.StubSiteverifyServer.
+"""
+
+import os
+import sys
+
+import mongomock
+import mongomock.gridfs
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Cheap hashes, read when app.py is imported
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+mongomock.gridfs.enable_gridfs_integration()
+
+import storage  # noqa: E402
+from recaptcha import StubSiteverifyServer  # noqa: E402
+
+
+@pytest.fixture
+def mongo_client():
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def store(mongo_client):
+    """storage.py bound to an empty database"""
+    storage.connect(mongo_client['epoch_test'])
+    yield storage
+    storage.disconnect()
+
+
+@pytest.fixture(scope='session')
+def siteverify():
+    with StubSiteverifyServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def epoch_app(mongo_client, siteverify, monkeypatch):
+    """app.py connected to an empty database, with reCAPTCHA always passing"""
+    import app as epoch
+
+    monkeypatch.setattr(epoch, '_db_initialized', False)
+    monkeypatch.setattr(epoch.recaptcha_verifier, 'verify_url', siteverify.url)
+    epoch.init_db(mongo_client)
+    yield epoch
+    storage.disconnect()
+
+
+@pytest.fixture
+def client(epoch_app):
+    return epoch_app.app.test_client()
+
+
+@pytest.fixture
+def signup_form():
+    """Builds a valid /api/register form for the i-th test user"""
+    return _signup_form
+
+
+def _signup_form(i, **overrides):
+    form = {
+        'name': 'Ravi Kumar',
+        'email': f'ravi{i}@gmail.com',
+        'password': 'sup3rsecret',
+        'phone': f'98765{i:05d}',
+        'college': 'Anna University',
+        'department': 'CSE',
+        'year': '3',
+        'foodPriority': 'veg',
+        'transactionId': f'TXN8823{i:05d}',
+        'g-recaptcha-response': 'token'
+    }
+    form.update(overrides)
+    return form
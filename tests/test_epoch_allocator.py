@@ -0,0 +1,93 @@
+"""storage.allocate_epoch_number / release_epoch_number and the free list"""
+
+import pytest
+
+
+def counter(store):
+    return store.counters_collection.find_one({'_id': store.EPOCH_ID_COUNTER})
+
+
+def test_hands_out_numbers_in_order_up_to_the_limit(store):
+    assert [store.allocate_epoch_number(3) for _ in range(4)] == [1, 2, 3, None]
+    assert store.issued_epoch_numbers() == 3
+
+
+def test_blocks_are_contiguous(store):
+    assert store.allocate_epoch_number(10, count=3) == 1
+    assert store.allocate_epoch_number(10, count=3) == 4
+    assert store.allocate_epoch_number(10, count=5) is None
+    assert store.allocate_epoch_number(10, count=4) == 7
+
+
+def test_seeds_from_existing_users(store):
+    store.users_collection.insert_many([
+        {'epochId': 'EPOCH007', 'epochNumber': 7},
+        {'epochId': 'EPOCH012'}
+    ])
+
+    assert store.allocate_epoch_number(100) == 13
+
+
+def test_releasing_the_latest_number_winds_the_counter_back(store):
+    store.allocate_epoch_number(10)
+    number = store.allocate_epoch_number(10)
+
+    store.release_epoch_number(number)
+
+    assert counter(store)['seq'] == 1
+    assert not counter(store).get('free')
+    assert store.allocate_epoch_number(10) == number
+
+
+def test_releasing_an_earlier_number_puts_it_on_the_free_list(store):
+    first, second, third = (store.allocate_epoch_number(10) for _ in range(3))
+
+    store.release_epoch_number(second)
+    store.release_epoch_number(first)
+
+    assert counter(store)['seq'] == third
+    assert counter(store)['free'] == [second, first]
+    assert store.allocate_epoch_number(10) == second
+    assert store.allocate_epoch_number(10) == first
+    assert store.allocate_epoch_number(10) == third + 1
+
+
+def test_free_list_does_not_take_a_number_twice(store):
+    for _ in range(3):
+        store.allocate_epoch_number(10)
+
+    store.release_epoch_number(2)
+    store.release_epoch_number(2)
+
+    assert counter(store)['free'] == [2]
+
+
+def test_released_block_goes_back_whole(store):
+    store.allocate_epoch_number(10, count=3)
+    store.allocate_epoch_number(10)
+
+    store.release_epoch_number(1, count=3)
+
+    assert counter(store)['free'] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('number', [4, 9])
+def test_never_frees_a_number_beyond_the_counter(store, number):
+    for _ in range(3):
+        store.allocate_epoch_number(10)
+
+    store.release_epoch_number(number)
+
+    assert counter(store)['seq'] == 3
+    assert not counter(store).get('free')
+
+
+def test_skips_free_numbers_a_user_already_holds(store):
+    for _ in range(3):
+        store.allocate_epoch_number(10)
+    store.users_collection.insert_one({'epochId': 'EPOCH002', 'epochNumber': 2})
+    store.counters_collection.update_one({'_id': store.EPOCH_ID_COUNTER}, {'$set': {'free': [2, 1]}})
+
+    assert store.allocate_epoch_number(10) == 1
+    assert counter(store)['free'] == []
+    assert store.allocate_epoch_number(10) == 4
@@ -0,0 +1,73 @@
+"""storage.apply_event_counters: the per-user event limit guard and its rollback"""
+
+REGISTRATION_ID = 'BBT-261018120000-0001'
+
+
+def add_users(store, counts):
+    store.users_collection.insert_many([
+        {'epochId': epoch_id, 'technicalEventsCount': count, 'registeredEvents': []}
+        for epoch_id, count in counts.items()
+    ])
+
+
+def user(store, epoch_id):
+    return store.users_collection.find_one({'epochId': epoch_id})
+
+
+def test_counts_every_participant(store):
+    add_users(store, {'EPOCH001': 0, 'EPOCH002': 2})
+
+    over_limit = store.apply_event_counters(['EPOCH001', 'EPOCH002'], 'technicalEventsCount', 3, REGISTRATION_ID)
+
+    assert over_limit == []
+    for epoch_id, count in (('EPOCH001', 1), ('EPOCH002', 3)):
+        assert user(store, epoch_id)['technicalEventsCount'] == count
+        assert user(store, epoch_id)['registeredEvents'] == [REGISTRATION_ID]
+
+
+def test_user_at_limit_rolls_back_teammates(store):
+    add_users(store, {'EPOCH001': 0, 'EPOCH002': 3, 'EPOCH003': 1})
+
+    over_limit = store.apply_event_counters(
+        ['EPOCH001', 'EPOCH002', 'EPOCH003'], 'technicalEventsCount', 3, REGISTRATION_ID)
+
+    assert over_limit == ['EPOCH002']
+    for epoch_id, count in (('EPOCH001', 0), ('EPOCH002', 3), ('EPOCH003', 1)):
+        assert user(store, epoch_id)['technicalEventsCount'] == count
+        assert user(store, epoch_id)['registeredEvents'] == []
+
+
+def test_rollback_leaves_other_registrations_alone(store):
+    store.users_collection.insert_many([
+        {'epochId': 'EPOCH001', 'technicalEventsCount': 1, 'registeredEvents': ['BBT-EARLIER']},
+        {'epochId': 'EPOCH002', 'technicalEventsCount': 3, 'registeredEvents': []}
+    ])
+
+    store.apply_event_counters(['EPOCH001', 'EPOCH002'], 'technicalEventsCount', 3, REGISTRATION_ID)
+
+    assert user(store, 'EPOCH001')['technicalEventsCount'] == 1
+    assert user(store, 'EPOCH001')['registeredEvents'] == ['BBT-EARLIER']
+
+
+def test_missing_counter_counts_as_zero(store):
+    store.users_collection.insert_one({'epochId': 'EPOCH001'})
+
+    assert store.apply_event_counters(['EPOCH001'], 'nonTechnicalEventsCount', 1, REGISTRATION_ID) == []
+    assert user(store, 'EPOCH001')['nonTechnicalEventsCount'] == 1
+    assert store.apply_event_counters(['EPOCH001'], 'nonTechnicalEventsCount', 1, 'PPT-2') == ['EPOCH001']
+
+
+def test_repeated_participant_is_counted_once(store):
+    add_users(store, {'EPOCH001': 0})
+
+    assert store.apply_event_counters(['EPOCH001', 'EPOCH001'], 'technicalEventsCount', 3, REGISTRATION_ID) == []
+    assert user(store, 'EPOCH001')['technicalEventsCount'] == 1
+
+
+def test_unknown_user_fails_the_registration(store):
+    add_users(store, {'EPOCH001': 0})
+
+    over_limit = store.apply_event_counters(['EPOCH001', 'EPOCH404'], 'technicalEventsCount', 3, REGISTRATION_ID)
+
+    assert over_limit == ['EPOCH404']
+    assert user(store, 'EPOCH001')['technicalEventsCount'] == 0
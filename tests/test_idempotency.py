@@ -0,0 +1,91 @@
+"""Idempotency-Key handling on /api/register: replay, release and stale claims"""
+
+from datetime import datetime, timedelta
+
+import idempotency
+
+
+def register(client, form, key):
+    return client.post('/api/register', data=form, headers={'Idempotency-Key': key})
+
+
+def claim(epoch_app, key, expires_in):
+    now = datetime.utcnow()
+    epoch_app.idempotency_collection.insert_one({
+        '_id': idempotency.record_id('/api/register', key),
+        'state': 'pending',
+        'createdAt': now - timedelta(minutes=10),
+        'expiresAt': now + expires_in
+    })
+
+
+def test_repeat_replays_the_first_response(client, epoch_app, signup_form):
+    first = register(client, signup_form(1), 'k1')
+    repeat = register(client, signup_form(1), 'k1')
+
+    assert first.status_code == 201
+    assert repeat.status_code == 201
+    assert repeat.get_json() == first.get_json()
+    assert repeat.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert epoch_app.users_collection.count_documents({}) == 1
+
+
+def test_failure_releases_the_key(client, epoch_app, signup_form):
+    rejected = register(client, signup_form(1, phone='12'), 'k1')
+    retried = register(client, signup_form(1), 'k1')
+
+    assert rejected.status_code == 400
+    assert retried.status_code == 201
+    assert 'Idempotent-Replayed' not in retried.headers
+
+
+def test_keys_are_per_client_request(client, signup_form):
+    assert register(client, signup_form(1), 'k1').status_code == 201
+    assert register(client, signup_form(2), 'k2').get_json()['epochId'] == 'EPOCH002'
+
+
+def test_live_claim_is_not_run_twice(client, epoch_app, signup_form):
+    claim(epoch_app, 'k1', timedelta(minutes=1))
+
+    response = register(client, signup_form(1), 'k1')
+
+    assert response.status_code == 409
+    assert response.get_json()['inProgress'] is True
+    assert epoch_app.users_collection.count_documents({}) == 0
+
+
+def test_stale_claim_is_taken_over(client, epoch_app, signup_form):
+    claim(epoch_app, 'k1', timedelta(minutes=-1))
+
+    response = register(client, signup_form(1), 'k1')
+
+    assert response.status_code == 201
+    record = epoch_app.idempotency_collection.find_one({'_id': idempotency.record_id('/api/register', 'k1')})
+    assert record['state'] == 'completed'
+    assert register(client, signup_form(1), 'k1').headers['Idempotent-Replayed'] == 'true'
+
+
+def test_takeover_only_matches_expired_pending_claims(mongo_client):
+    keys = mongo_client['epoch_test']['idempotency_keys']
+    now = datetime.utcnow()
+    keys.insert_many([
+        {'_id': 'expired', 'state': 'pending', 'expiresAt': now - timedelta(seconds=1)},
+        {'_id': 'live', 'state': 'pending', 'expiresAt': now + timedelta(minutes=1)},
+        {'_id': 'done', 'state': 'completed', 'expiresAt': now - timedelta(seconds=1)}
+    ])
+
+    taken = [
+        record_id for record_id in ('expired', 'live', 'done')
+        if keys.find_one_and_update(*idempotency.stale_claim_takeover(record_id))
+    ]
+
+    assert taken == ['expired']
+    assert keys.find_one({'_id': 'expired'})['expiresAt'] > now
+
+
+def test_oversized_key_is_refused(client, signup_form):
+    response = register(client, signup_form(1), 'k' * (idempotency.MAX_KEY_LENGTH + 1))
+
+    assert response.status_code == 400
+    assert response.get_json() == idempotency.INVALID_KEY
@@ -0,0 +1,117 @@
+"""ratelimit.SlidingWindowLimiter on both backends, around the window edges"""
+
+import fakeredis
+import pytest
+
+import ratelimit
+from ratelimit import MemoryBackend, RedisBackend, SlidingWindowLimiter, client_address, parse_rate
+
+LIMIT = 3
+WINDOW = 10
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'memory':
+        return MemoryBackend()
+    return RedisBackend(fakeredis.FakeRedis(server=fakeredis.FakeServer()))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 100.0 is the very start of a 10-second window
+    clock = Clock(100.0)
+    monkeypatch.setattr(ratelimit.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def limiter(backend, clock):
+    return SlidingWindowLimiter('login', backend, LIMIT, WINDOW)
+
+
+def test_allows_limit_then_blocks_until_window_ends(limiter, clock):
+    clock.now = 103.0
+
+    assert [limiter.hit('a') for _ in range(LIMIT)] == [0] * LIMIT
+    assert limiter.hit('a') == 7
+
+
+def test_keys_and_limiters_are_separate(limiter, backend):
+    other = SlidingWindowLimiter('check-email', backend, LIMIT, WINDOW)
+    for _ in range(LIMIT + 1):
+        limiter.hit('a')
+
+    assert limiter.hit('b') == 0
+    assert other.hit('a') == 0
+
+
+def test_previous_window_still_counts_at_the_boundary(limiter, clock):
+    for _ in range(LIMIT):
+        limiter.hit('a')
+
+    clock.now = 110.0
+    assert limiter.check('a') == 10
+
+
+def test_previous_window_fades_out(limiter, clock):
+    for _ in range(LIMIT):
+        limiter.hit('a')
+
+    # Half of the previous window overlaps: 3 * 0.5 + 1 <= 3
+    clock.now = 115.0
+    assert limiter.check('a') == 0
+    assert limiter.hit('a') == 0
+    # 3 * 0.5 + 2 > 3
+    assert limiter.hit('a') == 5
+
+
+def test_counts_are_forgotten_after_two_windows(limiter, clock):
+    for _ in range(LIMIT * 2):
+        limiter.hit('a')
+
+    clock.now = 110.0
+    assert limiter.check('a') > 0
+    clock.now = 120.0
+    assert limiter.check('a') == 0
+
+
+def test_rejected_requests_keep_counting(limiter, clock):
+    for _ in range(LIMIT * 4):
+        limiter.hit('a')
+
+    # Still over the limit with 60% of the previous window left: 12 * 0.4 + 1 > 3
+    clock.now = 116.0
+    assert limiter.check('a') == 4
+
+
+def test_check_does_not_count(limiter):
+    for _ in range(LIMIT * 2):
+        assert limiter.check('a') == 0
+
+    assert [limiter.hit('a') for _ in range(LIMIT)] == [0] * LIMIT
+    assert limiter.check('a') == 10
+
+
+def test_parse_rate():
+    assert parse_rate('20/60') == (20, 60.0)
+    assert parse_rate('5') == (5, 60.0)
+
+
+@pytest.mark.parametrize('forwarded_for, trusted_hops, expected', [
+    ('1.1.1.1, 10.0.0.2', 1, '10.0.0.2'),
+    ('6.6.6.6, 1.1.1.1, 10.0.0.2', 2, '1.1.1.1'),
+    ('1.1.1.1', 2, '10.0.0.1'),
+    ('1.1.1.1', 0, '10.0.0.1'),
+    ('', 1, '10.0.0.1'),
+])
+def test_client_address(forwarded_for, trusted_hops, expected):
+    assert client_address(forwarded_for, '10.0.0.1', trusted_hops) == expected
@@ -0,0 +1,154 @@
+"""
+EPOCH 2026 - Registration field validation
+Compiled rule set shared by /api/register (app.py) and the cleanup script (clearfake.py)
+"""
+
+import re
+import time
+from collections import namedtuple
+
+# ========== PATTERNS ==========
+# Compiled once at import. clearfake.py scores stored records with the same rules
+# in Python, so a pattern change applies to new signups and cleanup alike.
+
+FAKE_NAME_PATTERN = re.compile(r'^(user\d*|test\d*|admin\d*|fake\d*|asdf|qwerty|abc|xyz)$', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+FAKE_EMAIL_PATTERN = re.compile(r'^(user\d+|test\d*|fake\d*|admin\d*|abc\d*)@', re.IGNORECASE)
+PHONE_PATTERN = re.compile(r'^[6-9]\d{9}$')
+FAKE_PHONE_PATTERN = re.compile(r'^(\d)\1{5,}|^98000000|^12345|^00000')
+FAKE_COLLEGE_PATTERN = re.compile(r'^(test|fake|abc|xyz|college|university|school)$', re.IGNORECASE)
+FAKE_TXN_PATTERN = re.compile(r'^(test|fake|123+|abc|txn|trans|0+|1+)$', re.IGNORECASE)
+
+WEAK_PASSWORDS = frozenset(['123456', 'password', 'qwerty', 'abc123', '111111', '123123'])
+
+REQUIRED_FIELDS = ['name', 'email', 'password', 'phone', 'college', 'department', 'year', 'foodPriority', 'transactionId']
+
+
+# ========== RULES ==========
+
+# A rule fails when is_invalid(value) is true; value is already normalised
+Rule = namedtuple('Rule', ['name', 'is_invalid', 'message'])
+
+# Per field: (normaliser, rules in the order they are checked)
+FIELD_RULES = {
+    'name': (str.strip, [
+        Rule('name_too_short', lambda v: len(v) < 3, 'Name is too short'),
+        Rule('name_fake', lambda v: FAKE_NAME_PATTERN.match(v.replace(' ', '')) is not None, 'Please enter your real name'),
+        Rule('name_not_full', lambda v: len(v.split()) < 2, 'Please enter your full name (first and last name)'),
+    ]),
+    'email': (lambda v: v.lower().strip(), [
+        Rule('email_format', lambda v: EMAIL_PATTERN.match(v) is None, 'Invalid email format'),
+        Rule('email_fake', lambda v: FAKE_EMAIL_PATTERN.match(v) is not None, 'Please enter your real email address'),
+    ]),
+    'phone': (str.strip, [
+        Rule('phone_format', lambda v: PHONE_PATTERN.match(v) is None, 'Please enter a valid 10-digit Indian mobile number'),
+        Rule('phone_fake', lambda v: FAKE_PHONE_PATTERN.match(v) is not None, 'Please enter your real phone number'),
+    ]),
+    'college': (str.strip, [
+        Rule('college_too_short', lambda v: len(v) < 5, 'Please enter a valid college name'),
+        Rule('college_fake', lambda v: FAKE_COLLEGE_PATTERN.match(v) is not None, 'Please enter your actual college name'),
+    ]),
+    'transactionId': (str.strip, [
+        Rule('txn_too_short', lambda v: len(v) < 8, 'Transaction ID seems too short'),
+        Rule('txn_fake', lambda v: FAKE_TXN_PATTERN.match(v) is not None, 'Please enter a valid transaction ID'),
+    ]),
+    'password': (lambda v: v, [
+        Rule('password_too_short', lambda v: len(v) < 6, 'Password must be at least 6 characters'),
+        Rule('password_common', lambda v: v.lower() in WEAK_PASSWORDS, 'This password is too common. Please choose a stronger one.'),
+    ]),
+}
+
+
+def validate_registration(data, required=REQUIRED_FIELDS, fields=None):
+    """
+    Check registration form data against every rule in one pass
+
+    Args:
+        data: Mapping of form field -> string value
+        required: Fields that must be present and non-blank
+        fields: Only run the rules for these fields (default: all of FIELD_RULES)
+
+    Returns:
+        Dict of field -> error message, at most one message per field. Missing
+        fields come first, then rule failures in FIELD_RULES order, so the first
+        entry is the most relevant message to show. Empty when the data is valid.
+    """
+    errors = {}
+    for field in required:
+        value = data.get(field)
+        if value is None or not value.strip():
+            errors[field] = f'Missing required field: {field}'
+
+    for field in (fields or FIELD_RULES):
+        if field in errors or not data.get(field):
+            continue
+        normalise, rules = FIELD_RULES[field]
+        value = normalise(data[field])
+        for rule in rules:
+            if rule.is_invalid(value):
+                errors[field] = rule.message
+                break
+    return errors
+
+
+# ========== MICRO-BENCHMARK ==========
+
+def benchmark_rules(samples, iterations=2000):
+    """
+    Time every rule and a full validate_registration() call
+
+    Args:
+        samples: List of registration dicts to run the rules against
+        iterations: Times each sample is checked
+
+    Returns:
+        Dict of rule name -> average microseconds per check, plus
+        'validate_registration' for the cost of validating one request
+    """
+    timings = {}
+    for field, (normalise, rules) in FIELD_RULES.items():
+        values = [normalise(sample[field]) for sample in samples if sample.get(field)]
+        if not values:
+            continue
+        for rule in rules:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for value in values:
+                    rule.is_invalid(value)
+            elapsed = time.perf_counter() - started
+            timings[rule.name] = elapsed / (iterations * len(values)) * 1e6
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for sample in samples:
+            validate_registration(sample)
+    elapsed = time.perf_counter() - started
+    timings['validate_registration'] = elapsed / (iterations * len(samples)) * 1e6
+    return timings
+
+
+SAMPLE_REGISTRATIONS = [
+    {
+        'name': 'Priya Raman', 'email': 'priya.raman@gmail.com', 'password': 'Kurinji#2026',
+        'phone': '9876543210', 'college': 'PSG College of Technology', 'department': 'CSE',
+        'year': '3', 'foodPriority': 'veg', 'transactionId': 'T2601151234567890'
+    },
+    {
+        'name': 'user21', 'email': 'user21@mail.com', 'password': '123456',
+        'phone': '9800000021', 'college': 'test', 'department': 'IT',
+        'year': '2', 'foodPriority': 'non-veg', 'transactionId': '1111'
+    },
+]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Per-rule validation micro-benchmark')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'rule':<24} {'µs/check':>10}")
+    print("-" * 35)
+    for rule_name, micros in benchmark_rules(SAMPLE_REGISTRATIONS, args.iterations).items():
+        print(f"{rule_name:<24} {micros:>10.2f}")